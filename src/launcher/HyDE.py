@@ -14,6 +14,7 @@ import machine
 from font import vga1_8x16 as font
 from lib import display, sdcard, userinput
 from lib.hydra import color, config, popup
+from lib.hydra.scheduler import FrameScheduler
 
 
 # increased freq makes fancy text drawing faster.
@@ -1145,7 +1146,12 @@ def main_loop():
     # track previously locked keys for graphics redrawing
     prev_locked_keys = []
 
-    while True:
+    cursor_blink = None
+    scheduler = FrameScheduler(display=DISPLAY)
+
+    def update() -> bool:
+        """Handle user input."""
+        nonlocal redraw_display, prev_locked_keys, cursor_blink
         keys = INPUT.get_new_keys()
         mod_keys = INPUT.get_mod_keys()
 
@@ -1246,17 +1252,29 @@ def main_loop():
             elif len(key) == 1:
                 editor.insert_char(key)
 
+        # cursor blinks so it needs to be redrawn regularly
+        blink = time.ticks_ms() % _CURSOR_BLINK_MS < _CURSOR_BLINK_HALF
+        if blink != cursor_blink:
+            cursor_blink = blink
+            scheduler.invalidate()
+
+        return redraw_display
+
+    def draw():
+        """Draw the editor."""
+        nonlocal redraw_display
         # graphics!
         if redraw_display:
             redraw_display = False
             editor.draw_bg()
             editor.draw_lines()
             editor.draw_scrollbar()
-        else:
-            time.sleep_ms(1)
 
-        editor.draw_cursor()  # cursor blinks so it needs to be redrawn regularly
-        DISPLAY.show()
+        editor.draw_cursor()
+
+    scheduler.add_update(update)
+    scheduler.add_draw(draw)
+    scheduler.run()
 
 
 main_loop()
@@ -15,6 +15,7 @@ from lib.display import Display
 from lib.hydra import beeper, popup, loader
 from lib.hydra.config import Config
 from lib.hydra.i18n import I18n
+from lib.hydra.scheduler import FrameScheduler
 
 
 _MH_DISPLAY_HEIGHT = const(135)
@@ -210,6 +211,15 @@ class ListView:
             )
 
 
+    def is_scrolling(self) -> bool:
+        """Check if any visible item is too long, and has scrolling text."""
+        for item in self.items[self.view_index : self.view_index + _ITEMS_PER_SCREEN]:
+            # directories have an extra '/'
+            if len(item) + self.dir_dict.get(item, 0) > _CHARS_PER_SCREEN:
+                return True
+        return False
+
+
     def clamp_cursor(self):
         """Keep cursor in item range + keep view on cursor."""
         self.cursor_index %= len(self.items)
@@ -558,8 +568,11 @@ def main_loop(tft, kb, config, overlay):
     file_list, dir_dict = parse_files()
 
     view = ListView(tft, config, file_list, dir_dict)
+    scheduler = FrameScheduler(display=tft)
 
-    while True:
+    def update() -> bool:
+        """Handle user input."""
+        nonlocal view, file_list, dir_dict
         new_keys = kb.get_new_keys()
         kb.ext_dir_keys(new_keys)
 
@@ -572,10 +585,16 @@ def main_loop(tft, kb, config, overlay):
             overlay.error(repr(e))
             view, file_list, dir_dict = panic_recover()
 
+        # long file names scroll, so they must be redrawn constantly
+        return bool(new_keys) or view.is_scrolling()
+
+    def draw():
+        """Draw the file list."""
         view.draw()
-        tft.show()
 
-        time.sleep_ms(10)
+    scheduler.add_update(update)
+    scheduler.add_draw(draw)
+    scheduler.run()
 
 
 main_loop(tft, kb, config, overlay)
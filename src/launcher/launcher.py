@@ -48,6 +48,7 @@ from lib.display.rawbitmap import RawBitmap
 from lib.hydra import loader, beeper
 from lib.hydra.config import Config
 from lib.hydra.i18n import I18n
+from lib.hydra.scheduler import FrameScheduler
 
 
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ _CONSTANTS: ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
@@ -90,6 +91,11 @@ _APPNAME_Y = const(_ICON_Y + _ICON_HEIGHT + _Y_PADDING)
 _SCROLL_ANIMATION_TIME = const(350)
 _SCROLL_ANIMATION_QUICK = const(150)
 
+# icons are prefetched for this many apps on either side of the selection,
+# spending at most this long per (idle) frame
+_PREFETCH_RANGE = const(3)
+_PREFETCH_BUDGET_MS = const(8)
+
 
 _ASCII_MAX = const(128)
 
@@ -359,7 +365,7 @@ def draw_statusbar():
         formatted_time = f"{hour_24}:{minute:02d}"
     else:
         formatted_time, ampm = time_24_to_12(hour_24, minute)
-        DISPLAY.text(
+        DISPLAY.cached_text(
             ampm,
             _CLOCK_AMPM_X_OFFSET
             + (len(formatted_time)
@@ -367,7 +373,7 @@ def draw_statusbar():
             _CLOCK_AMPM_Y + 1,
             CONFIG.palette[5],
             )
-        DISPLAY.text(
+        DISPLAY.cached_text(
             ampm,
             _CLOCK_AMPM_X_OFFSET
             + (len(formatted_time)
@@ -376,12 +382,12 @@ def draw_statusbar():
             CONFIG.palette[2],
             )
 
-    DISPLAY.text(
+    DISPLAY.cached_text(
         formatted_time,
         _CLOCK_X, _CLOCK_Y+1,
         CONFIG.palette[2],
         )
-    DISPLAY.text(
+    DISPLAY.cached_text(
         formatted_time,
         _CLOCK_X, _CLOCK_Y,
         CONFIG.palette[7],
@@ -495,6 +501,11 @@ class IconWidget:
         self.anim_time = _SCROLL_ANIMATION_TIME
         self.anim_fac = 0.0
 
+        # maps app names to their icon (a builtin icon index, or a custom icon)
+        self._icons = {}
+        # the selection that icons were last prefetched around
+        self._prefetched = None
+
         self.force_update()
 
 
@@ -606,13 +617,24 @@ class IconWidget:
             self._draw_str_icon()
 
 
-    def _choose_icon(self) -> int|str:
+    def _choose_icon(self) -> int|str|RawBitmap:
         current_app_text = APP_NAMES[APP_SELECTOR_INDEX]
 
         # special menu options for settings
         if current_app_text == "UI Sound":
             return "On" if CONFIG['ui_sound'] else "Off"
 
+        # (prefetched icons are ready to use, without reading from storage)
+        icon = self._icons.get(current_app_text)
+        if icon is None:
+            icon = self._find_icon(current_app_text)
+            self._icons[current_app_text] = icon
+        return icon
+
+
+    @staticmethod
+    def _find_icon(app_name: str) -> int|RawBitmap:
+        """Find the icon for the given app, loading custom icons (through the AssetCache)."""
         builtin_icon_idxs = {
             "Settings": 2,
             "Reload Apps": 3,
@@ -620,19 +642,20 @@ class IconWidget:
             "Terminal": 5,
             "Get Apps": 6,
             }
-        if current_app_text in builtin_icon_idxs:
-            return builtin_icon_idxs[current_app_text]
+        if app_name in builtin_icon_idxs:
+            return builtin_icon_idxs[app_name]
 
-        current_app_path = APP_PATHS[current_app_text]
+        current_app_path = APP_PATHS[app_name]
 
         if current_app_path.endswith('.cli.py'):
             return _TERMINAL_ICON_IDX
 
         if not (current_app_path.endswith('.py') or current_app_path.endswith('.mpy')):
-            # too many ways for `os.listdir` to fail here, so just capture the error:
+            # too many ways for this to fail (usually there is just no icon), so just capture the error:
             try:
-                if 'icon.raw' in os.listdir(current_app_path):
-                    return RawBitmap(f"{current_app_path}/icon.raw", 32, 32, (CONFIG.palette[2], CONFIG.palette[8]))
+                return RawBitmap(
+                    f"{current_app_path}/icon.raw", 32, 32, (CONFIG.palette[2], CONFIG.palette[8]),
+                    )
             except OSError:
                 pass
 
@@ -642,6 +665,41 @@ class IconWidget:
         return _FLASH_ICON_IDX
 
 
+    def prefetch(self):
+        """Find and load the icons of the apps around the current selection.
+
+        This is done a little at a time (in idle frames), so that changing the selection
+        doesn't need to read from storage in the middle of the scroll animation.
+        """
+        if self.direction or self._prefetched == APP_SELECTOR_INDEX:
+            return
+
+        start_ms = time.ticks_ms()
+        num_apps = len(APP_NAMES)
+        for offset in range(1, _PREFETCH_RANGE + 1):
+            for idx in (APP_SELECTOR_INDEX + offset, APP_SELECTOR_INDEX - offset):
+                app_name = APP_NAMES[idx % num_apps]
+                if app_name == "UI Sound":
+                    # (this icon is just text)
+                    continue
+
+                if app_name in self._icons:
+                    continue
+                self._icons[app_name] = self._find_icon(app_name)
+
+                if time.ticks_diff(time.ticks_ms(), start_ms) >= _PREFETCH_BUDGET_MS:
+                    # continue on the next frame
+                    return
+
+        self._prefetched = APP_SELECTOR_INDEX
+
+
+    def clear_icons(self):
+        """Forget all found icons (for when the app list changes)."""
+        self._icons = {}
+        self._prefetched = None
+
+
     @staticmethod
     def _erase_icon():
         DISPLAY.rect(
@@ -683,7 +741,7 @@ def draw_app_name():
     # translate text (if applicable)
     current_app_text = I18N[current_app_text]
     # and draw app name
-    DISPLAY.text(
+    DISPLAY.cached_text(
         current_app_text,
         center_text_x(current_app_text), _APPNAME_Y,
         CONFIG.palette[8],
@@ -777,7 +835,12 @@ def main_loop():
     icon.draw()
 
 
-    while True:
+    scheduler = FrameScheduler(display=DISPLAY)
+
+
+    def update() -> bool:
+        """Handle input, and check for things that need redrawing."""
+        global APP_SELECTOR_INDEX, PREV_SELECTOR_INDEX  # noqa: PLW0603
 
         # ----------------------- check for key presses on the keyboard. Only if they weren't already pressed. ---------
         new_keys = KB.get_new_keys()
@@ -835,6 +898,7 @@ def main_loop():
                 elif APP_NAMES[APP_SELECTOR_INDEX] == "Reload Apps":
                     scan_apps()
                     APP_SELECTOR_INDEX = 0
+                    icon.clear_icons()
                     icon.start_scroll(-1)
 
                     BEEP.play(('C4', 'E4', 'G4'), 80)
@@ -887,24 +951,37 @@ def main_loop():
                                 break
 
         # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-        # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ Main Graphics: ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+        # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ WIFI and RTC: ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
         # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
+        if SYNCING_CLOCK:
+            try_sync_clock()
+
+        if time.localtime()[4] != LASTDRAWN_MINUTE:
+            scheduler.invalidate()
+
+        # load nearby icons between animations
+        # (this does nothing while the icon is animating, or once the nearby icons are ready)
+        icon.prefetch()
+
+        # stay at full speed while the icon is animating, or the clock is syncing
+        return bool(new_keys) or bool(icon.direction) or SYNCING_CLOCK
+
+
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ Main Graphics: ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    def draw():
+        """Draw the launcher graphics."""
         if time.localtime()[4] != LASTDRAWN_MINUTE:
             draw_statusbar()
 
         draw_app_selector(icon)
-        DISPLAY.show()
-
-        # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-        # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ WIFI and RTC: ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-        # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
-        if SYNCING_CLOCK:
-            try_sync_clock()
 
-        # short sleep makes the animation look a little less flickery
-        time.sleep_ms(5)
+    scheduler.add_update(update)
+    scheduler.add_draw(draw)
+    scheduler.run()
 
 
 # run the main loop!
@@ -13,6 +13,7 @@ import sys
 from lib.display import Display
 from lib.hydra.config import Config
 from lib.hydra import loader
+from lib.hydra.scheduler import FrameScheduler
 from lib.userinput import UserInput
 from lib.device import Device
 from launcher.terminal.terminal import Terminal
@@ -193,10 +194,14 @@ Type \x1b[1mhelp\x1b[22m to print a help message.\x1b[0m
     # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
     # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ INITIALIZATION: ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
-    redraw_counter = 0
     commands = get_commands(term)
     user_globals = {}
-    while True:
+    cursor_blink = None
+    scheduler = FrameScheduler(display=tft)
+
+    def update() -> bool:
+        """Handle user input."""
+        nonlocal cursor_blink
 
         # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
         # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ INPUT: ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
@@ -226,18 +231,24 @@ Type \x1b[1mhelp\x1b[22m to print a help message.\x1b[0m
                                 exec_line(inpt, user_globals, term)
                             except Exception as e:  # noqa: BLE001
                                 term.print(ctext(repr(e), "RED"))
+                        # user code may have drawn over the terminal
+                        term.lines_changed = True
             else:
                 term.type_key(key)
 
         # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
         # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ HOUSEKEEPING: ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-        if redraw_counter == 40 or keys:
-            redraw_counter = 0
-            term.draw()
-            tft.show()
-        else:
-            redraw_counter += 1
-            time.sleep_ms(10)
+        # redraw when the cursor blinks
+        blink = term._blink_state()
+        if blink != cursor_blink:
+            cursor_blink = blink
+            scheduler.invalidate()
+
+        return bool(keys)
+
+    scheduler.add_update(update)
+    scheduler.add_draw(term.draw)
+    scheduler.run()
 
 
 # start the main loop
@@ -14,6 +14,7 @@ _PRINT_LINE_START = const(_MH_DISPLAY_HEIGHT - 12 - (_NUM_PRINT_LINES * 11))
 _USER_LINE_HEIGHT = const(12)
 _USER_LINE_Y_FILL = const(_MH_DISPLAY_HEIGHT - _USER_LINE_HEIGHT)
 _USER_LINE_Y = const(_MH_DISPLAY_HEIGHT - 11)
+_LINE_HEIGHT = const(11)
 _MAX_TEXT_WIDTH = const(_MH_DISPLAY_WIDTH // 8)
 
 _CURSOR_BLINK_MS = const(500)
@@ -46,12 +47,17 @@ class Terminal:
         self.current_line = ''
         self.display = get_instance(Display, allow_init=False)
         self.user_input = get_instance(UserInput, allow_init=False)
-        self.lines_changed = False
+        # when True, all lines are redrawn on the next `draw`
+        self.lines_changed = True
+        # printed lines scroll up over everything above the user line
+        # (the first print line always starts above the top of the display)
+        self.display.set_scroll_area(0, _USER_LINE_HEIGHT)
 
 
     def clear(self):
         """Clear printed lines."""
         self.lines = [TermLine('')] * _NUM_PRINT_LINES
+        self.lines_changed = True
 
 
     @staticmethod
@@ -101,10 +107,26 @@ class Terminal:
         for line in lines:
             self.lines.append(TermLine(line))
             self.lines.pop(0)
-        self.lines_changed = True
+        if len(lines) < _NUM_PRINT_LINES and not self.lines_changed:
+            self._scroll_new_lines(len(lines))
+        else:
+            self.lines_changed = True
         self.draw()
         self.display.show()
 
+
+    def _scroll_new_lines(self, count: int):
+        """Scroll the printed lines up, and draw just the given number of new lines."""
+        height = count * _LINE_HEIGHT
+        self.display.scroll_lines(height)
+        self.display.rect(
+            0, _USER_LINE_Y_FILL - height, self.display.width, height, self.display.palette[2], fill=True,
+        )
+        y = _PRINT_LINE_START + (_NUM_PRINT_LINES - count) * _LINE_HEIGHT
+        for line in self.lines[_NUM_PRINT_LINES - count:]:
+            line.draw(0, y, self.display)
+            y += _LINE_HEIGHT
+
     def input(self, prmpt: str = '') -> str:
         """Get user input (Override the `input` built-in)."""
 
@@ -172,7 +194,8 @@ class Terminal:
             y = _PRINT_LINE_START
             for line in self.lines:
                 line.draw(0, y, self.display)
-                y += 11
+                y += _LINE_HEIGHT
+            self.lines_changed = False
 
         # Draw current user line
         self._draw_user_text(f'{os.getcwd()}$ ', self.current_line)
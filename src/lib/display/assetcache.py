@@ -0,0 +1,156 @@
+"""A shared cache of files loaded into memory (like `RawBitmap` images), for MicroHydra apps."""
+
+import gc
+import os
+
+
+_DEFAULT_BUDGET = const(16384)
+_DEFAULT_MIN_FREE = const(16384)
+
+# entry fields
+_BUF = const(0)
+_MTIME = const(1)
+_SIZE = const(2)
+_LAST_USED = const(3)
+
+
+
+class AssetCache:
+    """Keep recently used files in memory, so that they don't need to be re-read from flash or the SD card.
+
+    AssetCache is a singleton, so the launcher, apps, and `RawBitmap` all share the same cache.
+    Files are keyed by their path, and are reloaded if their modification time (or size) changes.
+
+    When the total size of the cached files exceeds the memory budget,
+    the least recently used files are discarded.
+    Files are also discarded when free memory (`gc.mem_free`) drops below `min_free`,
+    so that the cache gives way to apps that need the memory.
+    """
+
+    def __new__(cls, **kwargs):  # noqa: ARG003, D102
+        if not hasattr(cls, 'instance'):
+            cls.instance = super().__new__(cls)
+        return cls.instance
+
+
+    def __init__(self, *, budget: int = _DEFAULT_BUDGET, min_free: int = _DEFAULT_MIN_FREE):
+        """Create (or reconfigure) the AssetCache.
+
+        Kwargs:
+            budget (int): The maximum number of bytes used to store cached files.
+            min_free (int): Cached files are discarded when `gc.mem_free()` is lower than this.
+        """
+        self.budget = budget
+        self.min_free = min_free
+        if hasattr(self, '_entries'):
+            # already initialized; keep the cached files, but apply the new limits.
+            self.trim()
+            return
+
+        # maps path to [buffer, mtime, size, last used]
+        self._entries = {}
+        self._tick = 0
+        self.used = 0
+        self.hits = 0
+        self.misses = 0
+
+
+    def load(self, path: str) -> memoryview:
+        """Get the contents of the given file, reading it into the cache if needed.
+
+        Files larger than the budget are still read, but are not stored.
+        """
+        stat = os.stat(path)
+        size = stat[6]
+        mtime = stat[8]
+
+        entry = self._entries.get(path)
+        if entry is not None and entry[_MTIME] == mtime and entry[_SIZE] == size:
+            self.hits += 1
+        else:
+            self.misses += 1
+            if entry is not None:
+                # the file has changed
+                self.discard(path)
+            # (files that won't be stored don't evict anything)
+            store = size <= self.budget
+            if store:
+                self._make_room(size)
+            entry = [self._read(path, size), mtime, size, 0]
+            if store:
+                self._entries[path] = entry
+                self.used += size
+
+        self._tick += 1
+        entry[_LAST_USED] = self._tick
+        return entry[_BUF]
+
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._entries
+
+
+    def discard(self, path: str):
+        """Remove the given file from the cache (if it is stored)."""
+        entry = self._entries.pop(path, None)
+        if entry is not None:
+            self.used -= entry[_SIZE]
+
+
+    def clear(self):
+        """Discard every cached file."""
+        self._entries = {}
+        self.used = 0
+
+
+    def trim(self):
+        """Discard the least recently used files until the cache is within its budget, and free memory is above `min_free`."""
+        while self._entries and self.used > self.budget:
+            self._evict()
+        self._free_memory(self.min_free)
+
+
+    def _make_room(self, size: int):
+        """Discard files to make room for a new file of the given size."""
+        while self._entries and self.used + size > self.budget:
+            self._evict()
+        self._free_memory(self.min_free + size)
+
+
+    def _free_memory(self, target: int):
+        """Discard the least recently used files until `gc.mem_free()` should be at least `target`."""
+        free = gc.mem_free()
+        if free >= target or not self._entries:
+            return
+        # memory from discarded files is only counted as free once it has been collected,
+        # so estimate the freed memory from the file sizes, and collect once at the end.
+        while self._entries and free < target:
+            free += self._evict()
+        gc.collect()
+
+
+    def _evict(self) -> int:
+        """Remove the least recently used file, and return its size."""
+        oldest_path = None
+        oldest_tick = None
+        for path, entry in self._entries.items():
+            if oldest_tick is None or entry[_LAST_USED] < oldest_tick:
+                oldest_path = path
+                oldest_tick = entry[_LAST_USED]
+        size = self._entries[oldest_path][_SIZE]
+        self.discard(oldest_path)
+        return size
+
+
+    def _read(self, path: str, size: int) -> memoryview:
+        """Read the given file into a new buffer."""
+        try:
+            buf = bytearray(size)
+        except MemoryError:
+            # give up the whole cache, and try again
+            self.clear()
+            gc.collect()
+            buf = bytearray(size)
+        with open(path, 'rb') as f:
+            f.readinto(buf)
+        return memoryview(buf)
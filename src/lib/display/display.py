@@ -2,7 +2,10 @@
 
 import machine
 
+import framebuf
+
 from . import st7789
+from .overlay import Overlay
 
 
 # ~~~~~ Magic constants:
@@ -28,6 +31,10 @@ class Display(st7789.ST7789):
     """
 
     overlay_callbacks = []
+    overlays = []
+    draw_overlays = False
+    # the active PerfHUD (from `lib.display.perfhud`), or None when it is disabled
+    perf = None
 
     def __new__(cls, **kwargs):  # noqa: ARG003, D102
         if not hasattr(cls, 'instance'):
@@ -39,8 +46,32 @@ class Display(st7789.ST7789):
             self,
             *,
             use_tiny_buf=False,
+            async_show=False,
             **kwargs):
-        """Initialize the Display."""
+        """Initialize the Display.
+
+        Kwargs:
+            use_tiny_buf (bool):
+                Use a 4bit framebuffer, rather than a 16bit one.
+            use_gs8_buf (bool):
+                Use an 8bit framebuffer with a 256 color palette, rather than a 16bit one.
+            async_show (bool):
+                If True, a second framebuffer is allocated, and `show` hands the finished frame
+                to a background thread to be written to the display, so that the next frame can be drawn
+                while the last one is being sent.
+                If there is not enough memory for a second buffer, the display falls back to a regular `show`.
+            **kwargs (Any):
+                Passed on to the display driver.
+        """
+        # async show state (must exist before the driver calls `show` on init)
+        self._back_fbuf = None
+        # the (function, args) for the flush thread to call next
+        self._flush_job = None
+        # released to wake the flush thread when a job is ready
+        self._job_lock = None
+        # held from when a job is handed over, until the flush thread has finished it
+        self._idle_lock = None
+
         # mh_if TDECK:
         # # Enable Peripherals:
         # machine.Pin(10, machine.Pin.OUT, value=1)
@@ -68,6 +99,9 @@ class Display(st7789.ST7789):
             **kwargs,
             )
 
+        if async_show:
+            self._init_async_show()
+
 
     @staticmethod
     def _init_pin(target_pin, *args) -> machine.Pin|None:
@@ -77,14 +111,259 @@ class Display(st7789.ST7789):
         return machine.Pin(target_pin, *args)
 
 
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ Async show: ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    def _init_async_show(self):
+        """Allocate the back buffer and start the flush thread, if possible."""
+        if self.band_lines:
+            print("WARNING: async_show is not supported with band_lines, using a single buffer.")
+            return
+        try:
+            import _thread
+            buf = bytearray(len(memoryview(self.fbuf)))
+        except (ImportError, MemoryError) as e:
+            print(f"WARNING: async_show not available ({e}), using a single buffer.")
+            return
+
+        # copy the current frame so that both buffers start out identical
+        buf[:] = memoryview(self.fbuf)
+        self._back_fbuf = framebuf.FrameBuffer(
+            buf,
+            self.width,
+            self.height,
+            self.fbuf_format,
+            )
+        self._job_lock = _thread.allocate_lock()
+        self._job_lock.acquire()
+        self._idle_lock = _thread.allocate_lock()
+        _thread.start_new_thread(self._flush_worker, ())
+
+
+    def disable_async_show(self):
+        """Stop the flush thread and release the back buffer.
+
+        Can be used to free up memory for an app that is running low on RAM.
+        """
+        if self._back_fbuf is None:
+            return
+        # an empty job tells the flush thread to stop
+        self._idle_lock.acquire()
+        self._back_fbuf = None
+        self._flush_job = None
+        self._job_lock.release()
+        self._idle_lock.release()
+
+
+    def wait_flush(self):
+        """Wait until the previous frame has been fully written to the display.
+
+        When using `async_show`, this must be called before
+        sending other commands to the display, or using other devices on a shared SPI bus.
+        """
+        if self._back_fbuf is not None:
+            self._idle_lock.acquire()
+            self._idle_lock.release()
+
+
+    def _queue_flush(self, func, args):
+        """Hand a job to the flush thread (after the previous job has finished)."""
+        self._idle_lock.acquire()
+        self._flush_job = (func, args)
+        self._job_lock.release()
+
+
+    def _flush_worker(self):
+        """Write frames to the display as they are handed over by `show`. Runs in its own thread."""
+        while True:
+            # sleep until a job is handed over
+            self._job_lock.acquire()
+            job = self._flush_job
+            if job is None:
+                return
+            func, args = job
+            func(*args)
+            self._flush_job = None
+            self._idle_lock.release()
+
+
+    def _copy_regions(self, source, dest, regions, count: int):
+        """Copy the given regions from one framebuffer to another."""
+        # tiny buf has 2 pixels per byte, gs8 buf has 1 byte per pixel, normal buf has 2 bytes per pixel.
+        row_bytes = self._bytes_per_row(self.width)
+        source = memoryview(source)
+        dest = memoryview(dest)
+
+        idx = 0
+        while idx < count:
+            r = idx * 4
+            x_min = regions[r]
+            y_min = regions[r + 1]
+            x_max = regions[r + 2]
+            y_max = regions[r + 3]
+
+            if self.use_tiny_buf:
+                start = x_min // 2
+                end = (x_max + 1) // 2
+            elif self.use_gs8_buf:
+                start = x_min
+                end = x_max
+            else:
+                start = x_min * 2
+                end = x_max * 2
+
+            if start == 0 and end == row_bytes:
+                # full width rows can be copied in one go
+                dest[y_min * row_bytes : y_max * row_bytes] = source[y_min * row_bytes : y_max * row_bytes]
+            else:
+                row = y_min * row_bytes
+                for _ in range(y_max - y_min):
+                    dest[row + start : row + end] = source[row + start : row + end]
+                    row += row_bytes
+            idx += 1
+
+
+    def _flush_before_scroll(self):
+        """Send pending changes before the display is scrolled, keeping both framebuffers identical."""
+        if self._back_fbuf is None:
+            super()._flush_before_scroll()
+            return
+
+        self.wait_flush()
+        regions, count = self.reset_show_regions()
+        if count:
+            self._copy_regions(self.fbuf, self._back_fbuf, regions, count)
+            self._flush(self.fbuf, regions, count)
+
+
+    def _hw_scroll(self, lines: int):
+        """Scroll the display, and the back buffer along with it."""
+        if self._back_fbuf is not None:
+            # the back buffer was made identical by `_flush_before_scroll`,
+            # so it must be scrolled too, or it will be out of sync with the panel.
+            self._shift_rows(
+                self._back_fbuf,
+                self._scroll_top,
+                self.height - self._scroll_fixed_bottom,
+                lines,
+                )
+        super()._hw_scroll(lines)
+
+
+    def stream_image(self, *args, **kwargs):
+        """Draw an image file straight to the display, without loading it into memory.
+
+        When using `async_show`, each stripe of the image is written by the flush thread,
+        so that the next stripe can be read from storage at the same time.
+        (See `ST7789.stream_image` for the arguments)
+        """
+        # the last frame must be finished before the display window is changed.
+        self.wait_flush()
+        super().stream_image(*args, **kwargs)
+
+
+    def _async_stripes(self) -> bool:
+        """Check if stripes of streamed image data are written by the flush thread."""
+        # mh_if shared_sdcard_spi:
+        # return False
+        # mh_end_if
+        return self._back_fbuf is not None
+
+
+    def _write_stripe(self, data):
+        """Hand a stripe of streamed image data to the flush thread (or write it now, without `async_show`)."""
+        # mh_if shared_sdcard_spi:
+        # # TDeck shares SPI with SDCard, so the next stripe can't be read while this one is written
+        # super()._write_stripe(data)
+        # return
+        # mh_end_if
+        if self._back_fbuf is None:
+            super()._write_stripe(data)
+            return
+
+        self._queue_flush(self._write, (None, data))
+
+
+    def _wait_stripe(self):
+        """Wait until the last stripe of streamed image data has been written."""
+        self.wait_flush()
+
+
     def _draw_overlays(self):
-        """Call each overlay callback in Display.overlay_callbacks."""
+        """Update each overlay in Display.overlays, and call each callback in Display.overlay_callbacks.
+
+        Overlays are only redrawn when they have been invalidated, or when something was drawn over them.
+        Setting `Display.draw_overlays` to True forces every overlay to be redrawn.
+        (In banded mode, overlays are drawn with each band instead)
+        """
+        if self.band_lines:
+            return
+        redraw = Display.draw_overlays
+        Display.draw_overlays = False
+        overlays = Display.overlays
+
+        # Mark the regions of invalidated overlays as changed, so that any overlays underneath are also restored.
+        # (an overlay that draws less than before, like the locked keys, must not leave its old graphics behind)
+        for overlay in overlays:
+            if redraw or overlay.dirty:
+                self._set_show_area(overlay.x, overlay.y, overlay.x + overlay.width, overlay.y + overlay.height)
+
+        # opaque overlays first, so that transparent overlays are drawn over them
+        for overlay in overlays:
+            if overlay.opaque:
+                overlay.update(self, redraw=redraw)
+        for overlay in overlays:
+            if not overlay.opaque:
+                overlay.update(self, redraw=redraw)
+
+        for callback in Display.overlay_callbacks:
+            callback(self)
+
+
+    def _draw_band(self):
+        """Draw the current band, followed by every overlay (which must be redrawn in each band)."""
+        super()._draw_band()
+        # (opaque overlays first, like in `_draw_overlays`)
+        for overlay in Display.overlays:
+            if overlay.opaque:
+                overlay.callback(self)
+        for overlay in Display.overlays:
+            if not overlay.opaque:
+                overlay.callback(self)
+
         for callback in Display.overlay_callbacks:
             callback(self)
 
 
     def show(self):
         """Write changes to display."""
+        perf = Display.perf
+        if perf is not None:
+            # PerfHUD times each step of the frame
+            perf.show(self)
+            return
+
         self._draw_overlays()
-        super().show()
+        self._show_frame()
+
+
+    def _show_frame(self):
+        """Write changes to the display (after the overlays have been drawn)."""
+        if self._back_fbuf is None:
+            super().show()
+            return
+
+        # Async show: wait for the last frame, then hand this frame to the flush thread
+        self.wait_flush()
+        regions, count = self.reset_show_regions()
+        if count == 0:
+            return
+
+        front = self.fbuf
+        back = self._back_fbuf
+        # Keep the back buffer identical to the frame being sent,
+        # so that drawing can continue from where it left off.
+        self._copy_regions(front, back, regions, count)
+        self.fbuf = back
+        self._back_fbuf = front
+
+        self._queue_flush(self._flush, (front, regions, count))
 
@@ -1,8 +1,11 @@
 """The heart of MicroHydra graphics functionality."""
 
 
+import array
+
 import framebuf
 from .palette import Palette
+from .textcache import TextCache
 import lib.hydra.config
 from lib.hydra.utils import get_instance
 from machine import PWM
@@ -14,6 +17,25 @@ from machine import PWM
 # mh_end_if
 
 
+# The maximum number of separate dirty regions tracked between calls to `show`.
+# When this fills up, new regions are forced to merge with an existing one.
+_MAX_SHOW_REGIONS = const(8)
+
+# Rough cost (in pixels) of opening a new display window.
+# This accounts for the CASET/RASET/RAMWR commands,
+# as well as the Python overhead of starting another SPI transfer.
+# Two regions are merged when their union costs less than this plus their separate areas.
+_REGION_OVERHEAD = const(256)
+
+# Row flags, used when `skip_unchanged_rows` is enabled:
+_ROW_UNCHECKED = const(0)
+_ROW_UNCHANGED = const(1)
+_ROW_CHANGED = const(2)
+
+# RGB565 channels, spread out so that they can be blended all at once (green is moved to the top 16 bits)
+_BLEND_MASK = const(0x07e0f81f)
+
+
 
 class DisplayCore:
     """The core graphical functionality for the Display module.
@@ -32,8 +54,12 @@ class DisplayCore:
             rotation: int = 0,
             backlight = None,
             use_tiny_buf: bool = False,
+            use_gs8_buf: bool = False,
             reserved_bytearray: bytearray|None = None,
             needs_swap: bool = True,
+            skip_unchanged_rows: bool = False,
+            text_cache_size: int = 4096,
+            band_lines: int = 0,
             **kwargs):  # noqa: ARG002
         """Create the DisplayCore.
 
@@ -46,50 +72,140 @@ class DisplayCore:
             use_tiny_buf (bool):
                 Whether or not to use a smaller, 4bit framebuffer (rather than 16 bit).
                 If True, frame is stored in 4bits and converted line-by-line when `show` is called.
+            use_gs8_buf (bool):
+                Whether or not to use an 8bit framebuffer, with a 256 color palette.
+                Like `use_tiny_buf`, colors are palette indices, and are converted when `show` is called.
             reserved_bytearray (bytearray|None):
                 A pre-allocated byte array to use for the framebuffer (rather than creating one on init).
             needs_swap (bool):
                 Whether or not the RGB565 bytes must be swapped to show up correctly on the display.
+            skip_unchanged_rows (bool):
+                If True, a checksum of each row sent to the display is stored,
+                and rows that are unchanged since they were last sent are skipped by `show`.
+                This helps apps that redraw the whole screen every frame.
+            text_cache_size (int):
+                The maximum number of bytes used to store pre-rendered text for `cached_text`.
+            band_lines (int):
+                If nonzero, the framebuffer only holds this many lines,
+                and each frame is drawn (and shown) one horizontal band at a time, using `band_callback`.
+                This gives full color using only a few KB of RAM.
             **kwargs (Any):
                 Any other kwargs are captured and ignored.
                 This is an effort to allow any future/additional versions of this module to be more compatible.
         """
+        # height and width are swapped when rotation is 1 or 3
+        fbuf_width = height if (rotation % 2 == 1) else width
+        fbuf_height = width if (rotation % 2 == 1) else height
+        # banded mode only stores a strip of the display.
+        # (An even number of lines keeps each band a whole number of pixel pairs, for 12 bit color)
+        self.band_lines = min(band_lines + (band_lines & 1), fbuf_height)
+        if self.band_lines:
+            fbuf_height = self.band_lines
+            skip_unchanged_rows = False
+
+        # use_tiny_fbuf uses GS4 format (4 bits per pixel), and use_gs8_buf uses GS8 (8 bits per pixel),
+        # for less memory usage. Both store palette indices rather than colors.
+        self.use_tiny_buf = use_tiny_buf
+        self.use_gs8_buf = use_gs8_buf = use_gs8_buf and not use_tiny_buf
+        self.fbuf_format = framebuf.GS4_HMSB if use_tiny_buf \
+            else framebuf.GS8 if use_gs8_buf \
+            else framebuf.RGB565
+
         #init the fbuf
         if reserved_bytearray is None:
-            # use_tiny_fbuf tells us to use a smaller framebuffer (4 bits per pixel rather than 16 bits)
-            if use_tiny_buf:
-                # round width up to 8 bits
-                size = (height * width) // 2 if (width % 8 == 0) else (height * (width + 1)) // 2
-                reserved_bytearray = bytearray(size)
-            else: # full sized buffer
-                reserved_bytearray = bytearray(height*width*2)
+            reserved_bytearray = bytearray(self._bytes_per_row(fbuf_width) * fbuf_height)
 
         self.fbuf = framebuf.FrameBuffer(
             reserved_bytearray,
-            # height and width are swapped when rotation is 1 or 3
-            height if (rotation % 2 == 1) else width,
-            width if (rotation % 2 == 1) else height,
-            # use_tiny_fbuf uses GS4 format for less memory usage
-            framebuf.GS4_HMSB if use_tiny_buf else framebuf.RGB565,
+            fbuf_width,
+            fbuf_height,
+            self.fbuf_format,
             )
+        # In banded mode, `_band_y` is the display row at the top of the framebuffer,
+        # and every drawing method moves its y coordinates up by that much.
+        # Drawing is clipped to the framebuffer (`_fbuf_height`), which is the current band.
+        self._band_y = 0
+        self._fbuf_height = fbuf_height
+        self.band_callback = None
         self.config = get_instance(lib.hydra.config.Config)
         self.palette = get_instance(Palette)
-        self.palette.use_tiny_buf = self.use_tiny_buf = use_tiny_buf
-
-        # keep track of min/max y vals for writing to display
-        # this speeds up drawing significantly.
-        # only y value is currently used, because framebuffer is stored in horizontal lines,
-        # making y slices much simpler than x slices.
-        self._show_y_min = width if (rotation % 2 == 1) else height
-        self._show_y_max = 0
+        self.palette.use_tiny_buf = use_tiny_buf or use_gs8_buf
+        if use_gs8_buf and len(self.palette) < 256:
+            self.palette.resize(256)
+
+        # keep track of the areas that have been drawn to, for writing to display.
+        # this speeds up drawing significantly, because only the changed
+        # areas of the framebuffer need to be sent over SPI.
+        # Each region is stored as 4 values: x_min, y_min, x_max, y_max (max values are exclusive)
+        # Two region lists are kept so that one can be swapped out by `show`.
+        self._show_regions = array.array('H', bytes(_MAX_SHOW_REGIONS * 8))
+        self._spare_regions = array.array('H', bytes(_MAX_SHOW_REGIONS * 8))
+        self._show_region_count = 0
+        self._show_merges = 0
+
+        # per-frame stats, updated each time `show` is called:
+        self.show_regions = 0
+        self.show_bytes = 0
+        self.show_merges = 0
+
+        # optional row diffing.
+        # A 30 bit hash is stored for each row, along with a flag used while checking rows in `show`.
+        self.skip_unchanged_rows = skip_unchanged_rows
+        self.rows_sent = 0
+        self.rows_skipped = 0
+        if skip_unchanged_rows:
+            self._row_bytes = self._bytes_per_row(fbuf_width)
+            self._row_hashes = bytearray(fbuf_height * 4)
+            self._row_flags = bytearray(fbuf_height)
+            self.invalidate_row_hashes()
 
         self.width = width
         self.height = height
+        # rows fixed at the top/bottom of the display when using `scroll_lines`
+        self._scroll_top = 0
+        self._scroll_fixed_bottom = 0
         self.needs_swap = needs_swap
+        # colors only need swapping when drawing RGB565 values to a panel that expects the other byte order
+        self._swap_colors = needs_swap and not (use_tiny_buf or use_gs8_buf)
         self.backlight = PWM(backlight, freq=1000, duty_u16=0) if backlight is not None else None
 
+        # the last palette lookup table used by `blend_rect` (for use_tiny_buf/use_gs8_buf)
+        self._blend_key = None
+        self._blend_lut = None
+        # (for use_gs8_buf, only the colors that have been blended are filled in)
+        self._blend_done = None
+
+        # pre-rendered text masks, used by `cached_text`
+        self.text_cache = TextCache(self, text_cache_size)
+
+        # mh_if not frozen:
+        # When not frozen, UTF8 glyphs are read from a binary file.
+        # Recently used glyphs are kept in a fixed-size cache, so they don't need to be re-read each frame.
+        # Each glyph is 8 bytes in `_glyph_slab`, and its codepoint is stored in `_glyph_keys` (-1 when empty).
+        # Slots are evicted using the 'CLOCK' algorithm, with a reference flag for each slot.
+        self._glyph_cache_size = max(1, int(self.config['glyph_cache_size']))
+        self._glyph_slab = bytearray(self._glyph_cache_size * 8)
+        self._glyph_view = memoryview(self._glyph_slab)
+        self._glyph_keys = bytearray(b'\xff' * (self._glyph_cache_size * 4))
+        self._glyph_refs = bytearray(self._glyph_cache_size)
+        self._glyph_hand = 0
+        self.glyph_hits = 0
+        self.glyph_misses = 0
+        # mh_end_if
+
 
     # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ DisplayCore utils: ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    def _draw_band(self):
+        """Draw the current band of the display (in banded mode), by calling `band_callback`.
+
+        The callback takes no arguments, and should draw the entire display (starting with `fill`).
+        Only the part of the drawing that falls inside the current band is kept.
+        Without a callback, the framebuffer is repeated down the display (which is useful for clearing it).
+        """
+        if self.band_callback is not None:
+            self.band_callback()
+
+
     def set_brightness(self, brightness: int):
         """Set backlight PWM using value 0-10."""
         _MAX_BRIGHT = const(65535)
@@ -99,37 +215,240 @@ class DisplayCore:
         self.backlight.duty_u16(brightness)
 
 
-    def reset_show_y(self) -> tuple[int, int]:
-        """Return and reset y boundaries."""
-        # clamp min and max
-        y_min = max(self._show_y_min, 0)
-        y_max = min(self._show_y_max, self.height)
+    def reset_show_regions(self) -> tuple[array.array, int]:
+        """Return and reset the regions to be shown.
 
-        self._show_y_min = self.height
-        self._show_y_max = 0
+        Returns a tuple containing an array of regions, and the number of regions in that array.
+        Each region is 4 values long, formatted as `x_min, y_min, x_max, y_max` (max values are exclusive).
+        """
+        regions = self._show_regions
+        count = self._show_region_count
+
+        # swap in the spare region list, so that the returned one is not modified by further drawing.
+        self._show_regions = self._spare_regions
+        self._spare_regions = regions
+        self._show_region_count = 0
 
-        return y_min, y_max
+        self.show_merges = self._show_merges
+        self._show_merges = 0
+
+        return regions, count
 
 
     @micropython.viper
-    def _set_show_y(self, y0: int, y1: int):
-        """Set/store minimum and maximum Y to show next time show() is called."""
-        y_min = int(self._show_y_min)
-        y_max = int(self._show_y_max)
+    def area_touched(self, x0: int, y0: int, x1: int, y1: int) -> bool:
+        """Check if anything has been drawn in the given area since the last call to `show`.
 
-        if y_min > y0:
-            y_min = y0
-        if y_max < y1:
-            y_max = y1
+        The max values are exclusive.
+        This may return True for areas near (but outside) the drawn areas, because nearby regions are merged.
+        """
+        regions = ptr16(self._show_regions)
+        count = int(self._show_region_count)
 
-        self._show_y_min = y_min
-        self._show_y_max = y_max
+        idx = 0
+        while idx < count:
+            r = idx * 4
+            if int(regions[r]) < x1 and x0 < int(regions[r + 2]) \
+            and int(regions[r + 1]) < y1 and y0 < int(regions[r + 3]):
+                return True
+            idx += 1
+        return False
+
+
+    @micropython.viper
+    def _set_show_area(self, x0: int, y0: int, x1: int, y1: int):
+        """Add the given area to the regions to show next time show() is called.
+
+        x1 and y1 are exclusive.
+        The new area is merged with any existing region where the union of the two
+        is cheaper to send than both regions separately.
+        """
+        # clamp to framebuffer bounds
+        width = int(self.width)
+        height = int(self._fbuf_height)
+        if x0 < 0:
+            x0 = 0
+        if y0 < 0:
+            y0 = 0
+        if x1 > width:
+            x1 = width
+        if y1 > height:
+            y1 = height
+        if x0 >= x1 or y0 >= y1:
+            return
+
+        regions = ptr16(self._show_regions)
+        count = int(self._show_region_count)
+        merges = int(self._show_merges)
+
+        idx = 0
+        while idx < count:
+            r = idx * 4
+            rx0 = int(regions[r])
+            ry0 = int(regions[r + 1])
+            rx1 = int(regions[r + 2])
+            ry1 = int(regions[r + 3])
+
+            # fast path for areas that are already covered
+            if rx0 <= x0 and ry0 <= y0 and rx1 >= x1 and ry1 >= y1:
+                # (the count may have changed, if other regions were absorbed first)
+                self._show_region_count = count
+                self._show_merges = merges + 1
+                return
+
+            ux0 = rx0 if rx0 < x0 else x0
+            uy0 = ry0 if ry0 < y0 else y0
+            ux1 = rx1 if rx1 > x1 else x1
+            uy1 = ry1 if ry1 > y1 else y1
+
+            union_cost = (ux1 - ux0) * (uy1 - uy0)
+            separate_cost = (rx1 - rx0) * (ry1 - ry0) + (x1 - x0) * (y1 - y0) + _REGION_OVERHEAD
+
+            if union_cost <= separate_cost:
+                # absorb the existing region into the new area,
+                # and remove it from the list (by moving the last region into its place)
+                x0 = ux0
+                y0 = uy0
+                x1 = ux1
+                y1 = uy1
+                count -= 1
+                last = count * 4
+                regions[r] = regions[last]
+                regions[r + 1] = regions[last + 1]
+                regions[r + 2] = regions[last + 2]
+                regions[r + 3] = regions[last + 3]
+                merges += 1
+                # new area has grown, so it must be checked against every region again
+                idx = 0
+            else:
+                idx += 1
+
+        if count >= _MAX_SHOW_REGIONS:
+            # no room for a new region; merge into the region that grows the least.
+            best_idx = 0
+            best_growth = width * height
+            idx = 0
+            while idx < count:
+                r = idx * 4
+                rx0 = int(regions[r])
+                ry0 = int(regions[r + 1])
+                rx1 = int(regions[r + 2])
+                ry1 = int(regions[r + 3])
+                ux0 = rx0 if rx0 < x0 else x0
+                uy0 = ry0 if ry0 < y0 else y0
+                ux1 = rx1 if rx1 > x1 else x1
+                uy1 = ry1 if ry1 > y1 else y1
+                growth = (ux1 - ux0) * (uy1 - uy0) - (rx1 - rx0) * (ry1 - ry0)
+                if growth < best_growth:
+                    best_growth = growth
+                    best_idx = idx
+                idx += 1
+
+            r = best_idx * 4
+            if int(regions[r]) < x0:
+                x0 = int(regions[r])
+            if int(regions[r + 1]) < y0:
+                y0 = int(regions[r + 1])
+            if int(regions[r + 2]) > x1:
+                x1 = int(regions[r + 2])
+            if int(regions[r + 3]) > y1:
+                y1 = int(regions[r + 3])
+            merges += 1
+        else:
+            r = count * 4
+            count += 1
+
+        regions[r] = x0
+        regions[r + 1] = y0
+        regions[r + 2] = x1
+        regions[r + 3] = y1
+
+        self._show_region_count = count
+        self._show_merges = merges
+
+
+    @micropython.viper
+    def invalidate_row_hashes(self):
+        """Forget the stored row hashes, so that every row is sent next time.
+
+        (Only used when `skip_unchanged_rows` is enabled.)
+        """
+        if not self.skip_unchanged_rows:
+            return
+        hashes = ptr32(self._row_hashes)
+        num_rows = int(len(self._row_flags))
+        idx = 0
+        while idx < num_rows:
+            # -1 can never match a 30 bit hash
+            hashes[idx] = -1
+            idx += 1
+
+
+    @micropython.viper
+    def _diff_rows(self, fbuf, y_min: int, y_max: int):
+        """Hash the given rows, and flag the rows that have changed since they were last sent.
+
+        Rows that have already been checked (by an overlapping region) are not checked again.
+        """
+        hashes = ptr32(self._row_hashes)
+        flags = ptr8(self._row_flags)
+        source32 = ptr32(fbuf)
+        source8 = ptr8(fbuf)
+        row_bytes = int(self._row_bytes)
+        # ptr32 is only used when every row is word-aligned
+        use_words = (row_bytes & 3) == 0
+
+        y = y_min
+        while y < y_max:
+            if flags[y] == _ROW_UNCHECKED:
+                # djb2-style hash, masked to 30 bits to keep it a small int
+                h = 5381
+                if use_words:
+                    idx = (y * row_bytes) >> 2
+                    end_idx = idx + (row_bytes >> 2)
+                    while idx < end_idx:
+                        h = (((h << 5) + h) ^ int(source32[idx])) & 0x3fffffff
+                        idx += 1
+                else:
+                    idx = y * row_bytes
+                    end_idx = idx + row_bytes
+                    while idx < end_idx:
+                        h = (((h << 5) + h) ^ int(source8[idx])) & 0x3fffffff
+                        idx += 1
+
+                if int(hashes[y]) == h:
+                    flags[y] = _ROW_UNCHANGED
+                else:
+                    hashes[y] = h
+                    flags[y] = _ROW_CHANGED
+            y += 1
+
+
+    @micropython.viper
+    def _clear_row_flags(self):
+        """Reset all row flags to `_ROW_UNCHECKED`."""
+        flags = ptr8(self._row_flags)
+        num_rows = int(len(self._row_flags))
+        idx = 0
+        while idx < num_rows:
+            flags[idx] = _ROW_UNCHECKED
+            idx += 1
+
+
+    def _bytes_per_row(self, width: int) -> int:
+        """Get the number of bytes used by a row of the given width, in the framebuffer's format."""
+        if self.use_tiny_buf:
+            # 4-bit rows are padded to a whole byte
+            return (width + 1) // 2
+        if self.use_gs8_buf:
+            return width
+        return width * 2
 
 
     @micropython.viper
     def _format_color(self, color: int) -> int:
         """Swap color bytes if needed, do nothing otherwise."""
-        if (not self.use_tiny_buf) and self.needs_swap:
+        if self._swap_colors:
             color = ((color & 0xff) << 8) | (color >> 8)
         return color
 
@@ -155,12 +474,10 @@ class DisplayCore:
             key (int): color to be considered transparent
             palette (framebuf): the color pallete to use for the buffer
         """
-        self._set_show_y(y, y + height)
+        y -= self._band_y
+        self._set_show_area(x, y, x + width, y + height)
         if not isinstance(buffer, framebuf.FrameBuffer):
-            buffer = framebuf.FrameBuffer(
-                buffer, width, height,
-                framebuf.GS4_HMSB if self.use_tiny_buf else framebuf.RGB565,
-                )
+            buffer = framebuf.FrameBuffer(buffer, width, height, self.fbuf_format)
 
         self.fbuf.blit(buffer, x, y, key, palette)
 
@@ -175,7 +492,7 @@ class DisplayCore:
             color (int): 565 encoded color
         """
         # whole display must show
-        self._set_show_y(0, self.height)
+        self._set_show_area(0, 0, self.width, self.height)
         color = self._format_color(color)
         self.fbuf.fill(color)
 
@@ -188,7 +505,8 @@ class DisplayCore:
             Y (int): y coordinate
             color (int): 565 encoded color
         """
-        self._set_show_y(y, y)
+        y -= self._band_y
+        self._set_show_area(x, y, x + 1, y + 1)
         color = self._format_color(color)
         self.fbuf.pixel(x,y,color)
 
@@ -202,7 +520,8 @@ class DisplayCore:
             length (int): length of line
             color (int): 565 encoded color
         """
-        self._set_show_y(y, y + length)
+        y -= self._band_y
+        self._set_show_area(x, y, x + 1, y + length)
         color = self._format_color(color)
         self.fbuf.vline(x, y, length, color)
 
@@ -216,7 +535,8 @@ class DisplayCore:
             length (int): length of line
             color (int): 565 encoded color
         """
-        self._set_show_y(y, y+1)
+        y -= self._band_y
+        self._set_show_area(x, y, x + length, y + 1)
         color = self._format_color(color)
         self.fbuf.hline(x, y, length, color)
 
@@ -232,9 +552,13 @@ class DisplayCore:
             y1 (int): End point y coordinate
             color (int): 565 encoded color
         """
-        self._set_show_y(
-            min(y0,y1),
-            max(y0,y1),
+        y0 -= self._band_y
+        y1 -= self._band_y
+        self._set_show_area(
+            min(x0, x1),
+            min(y0, y1),
+            max(x0, x1) + 1,
+            max(y0, y1) + 1,
         )
         color = self._format_color(color)
         self.fbuf.line(x0, y0, x1, y1, color)
@@ -250,7 +574,8 @@ class DisplayCore:
             height (int): Height in pixels
             color (int): 565 encoded color
         """
-        self._set_show_y(y, y + h)
+        y -= self._band_y
+        self._set_show_area(x, y, x + w, y + h)
         color = self._format_color(color)
         self.fbuf.rect(x,y,w,h,color,fill)
 
@@ -275,7 +600,8 @@ class DisplayCore:
             color (int): 565 encoded color
             fill (bool): fill in the ellipse. Default is False
         """
-        self._set_show_y(y - yr, y + yr + 1)
+        y -= self._band_y
+        self._set_show_area(x - xr, y - yr, x + xr + 1, y + yr + 1)
         color = self._format_color(color)
         self.fbuf.ellipse(x,y,xr,yr,color,fill,m)
 
@@ -290,13 +616,237 @@ class DisplayCore:
             color (int): Color of polygon
             fill (bool=False) : fill the polygon (or draw an outline)
         """
-        # calculate approx height so min/max can be set
-        h = max(coords)
-        self._set_show_y(y, y + h)
+        # calculate approx bounds so min/max can be set
+        # (x and y are not separated, so this may overestimate the area)
+        lo = min(coords)
+        hi = max(coords)
+        y -= self._band_y
+        self._set_show_area(x + lo, y + lo, x + hi + 1, y + hi + 1)
         color = self._format_color(color)
         self.fbuf.poly(x, y, coords, color, fill)
 
 
+    def blend_rect(self, x: int, y: int, w: int, h: int, color: int, alpha: int):
+        """Blend a color over a rectangle of the display.
+
+        Args:
+            x (int): Top left corner x coordinate
+            y (int): Top left corner y coordinate
+            w (int): Width in pixels
+            h (int): Height in pixels
+            color (int): 565 encoded color (or palette index, when using `use_tiny_buf` or `use_gs8_buf`)
+            alpha (int): Opacity of the color, from 0 (invisible) to 255 (solid)
+        """
+        if self.use_tiny_buf or self.use_gs8_buf:
+            # get the 565 color from the palette
+            color = self.palette.buf[color * 2] | (self.palette.buf[color * 2 + 1] << 8)
+        self._blend_rect(x, y, w, h, color, alpha)
+
+
+    def dim_rect(self, x: int, y: int, w: int, h: int, amount: int = 128):
+        """Darken a rectangle of the display.
+
+        Args:
+            x (int): Top left corner x coordinate
+            y (int): Top left corner y coordinate
+            w (int): Width in pixels
+            h (int): Height in pixels
+            amount (int): How much to darken the area, from 0 (not at all) to 255 (black)
+        """
+        self._blend_rect(x, y, w, h, 0, amount)
+
+
+    def _blend_rect(self, x: int, y: int, w: int, h: int, color: int, alpha: int):
+        """Clip the rectangle, then blend the (unformatted) 565 color over it."""
+        y -= self._band_y
+        x0 = max(0, x)
+        y0 = max(0, y)
+        x1 = min(self.width, x + w)
+        y1 = min(self._fbuf_height, y + h)
+        if x1 <= x0 or y1 <= y0 or alpha <= 0:
+            return
+        self._set_show_area(x0, y0, x1, y1)
+
+        # alpha is reduced to 5 bits (0-32), for blending in fixed point
+        alpha = (min(alpha, 255) + 4) >> 3
+        if self.use_tiny_buf:
+            self._remap_rect(x0, y0, x1 - x0, y1 - y0, self._blend_table(color, alpha))
+        elif self.use_gs8_buf:
+            lut = self._blend_table8(color, alpha, self._used_colors(x0, y0, x1 - x0, y1 - y0))
+            self._remap_rect8(x0, y0, x1 - x0, y1 - y0, lut)
+        else:
+            self._blend_rect565(x0, y0, x1 - x0, y1 - y0, color, alpha)
+
+
+    @staticmethod
+    @micropython.viper
+    def _blend_color(color1:int, color2:int, alpha:int) -> int:
+        """Blend color2 over color1, with a 5 bit alpha (0-32)."""
+        color1 = (color1 | (color1 << 16)) & _BLEND_MASK
+        color2 = (color2 | (color2 << 16)) & _BLEND_MASK
+        color1 = (color1 + (((color2 - color1) * alpha) >> 5)) & _BLEND_MASK
+        return (color1 | (color1 >> 16)) & 0xffff
+
+
+    @micropython.viper
+    def _blend_rect565(self, x:int, y:int, w:int, h:int, color:int, alpha:int):
+        """Blend a color over a (clipped) area of the RGB565 framebuffer."""
+        fbuf16 = ptr16(self.fbuf)
+        self_width = int(self.width)
+        swap = bool(self._swap_colors)
+        color = (color | (color << 16)) & _BLEND_MASK
+
+        row = y * self_width + x
+        end_row = row + h * self_width
+        while row < end_row:
+            idx = row
+            end_idx = row + w
+            while idx < end_idx:
+                px = int(fbuf16[idx])
+                if swap:
+                    px = ((px & 0xff) << 8) | (px >> 8)
+                px = (px | (px << 16)) & _BLEND_MASK
+                px = (px + (((color - px) * alpha) >> 5)) & _BLEND_MASK
+                px = (px | (px >> 16)) & 0xffff
+                if swap:
+                    px = ((px & 0xff) << 8) | (px >> 8)
+                fbuf16[idx] = px
+                idx += 1
+            row += self_width
+
+
+    def _blend_table(self, color: int, alpha: int) -> bytearray:
+        """Get a table that maps each pair of palette indices to the blended (closest) palette colors.
+
+        The table has one entry for every possible framebuffer byte (two 4-bit pixels),
+        and the last table is kept, so that repeated blends don't need to rebuild it.
+        """
+        palette = bytes(self.palette.buf)
+        key = (color, alpha, palette)
+        if self._blend_key == key:
+            return self._blend_lut
+
+        colors = [palette[i * 2] | (palette[i * 2 + 1] << 8) for i in range(16)]
+        remap = [self._closest_color(colors, self._blend_color(clr, color, alpha)) for clr in colors]
+
+        lut = bytearray(256)
+        for byte in range(256):
+            lut[byte] = (remap[byte >> 4] << 4) | remap[byte & 0xf]
+        self._blend_key = key
+        self._blend_lut = lut
+        return lut
+
+
+    def _blend_table8(self, color: int, alpha: int, used: bytearray) -> bytearray:
+        """Get a table that maps each palette index to the blended (closest) palette color, for the 8-bit framebuffer.
+
+        Finding the closest of 256 colors is slow, so only the colors flagged in `used` are looked up.
+        The last table is kept, and is filled in as more colors are blended.
+        """
+        palette = bytes(self.palette.buf)
+        key = (color, alpha, palette)
+        if self._blend_key != key:
+            self._blend_key = key
+            self._blend_lut = bytearray(256)
+            self._blend_done = bytearray(256)
+        lut = self._blend_lut
+        done = self._blend_done
+
+        colors = None
+        for idx in range(256):
+            if used[idx] and not done[idx]:
+                if colors is None:
+                    colors = [palette[i * 2] | (palette[i * 2 + 1] << 8) for i in range(len(palette) // 2)]
+                lut[idx] = self._closest_color(colors, self._blend_color(colors[idx], color, alpha))
+                done[idx] = 1
+        return lut
+
+
+    @staticmethod
+    def _closest_color(colors: list[int], color: int) -> int:
+        """Find the index of the closest RGB565 color in the given list."""
+        red, green, blue = color >> 11, (color >> 5) & 0x3f, color & 0x1f
+        best_idx = 0
+        best_dist = 0x7fffffff
+        for idx, target in enumerate(colors):
+            # green has an extra bit, so it is halved to weigh the channels evenly
+            dist = ((target >> 11) - red) ** 2 \
+                + ((((target >> 5) & 0x3f) - green) // 2) ** 2 \
+                + ((target & 0x1f) - blue) ** 2
+            if dist < best_dist:
+                best_idx = idx
+                best_dist = dist
+        return best_idx
+
+
+    @micropython.viper
+    def _used_colors(self, x:int, y:int, w:int, h:int):
+        """Flag each palette index that is used in a (clipped) area of the 8-bit framebuffer."""
+        used = bytearray(256)
+        used8 = ptr8(used)
+        fbuf8 = ptr8(self.fbuf)
+        self_width = int(self.width)
+
+        row = y * self_width + x
+        end_row = row + h * self_width
+        while row < end_row:
+            idx = row
+            end_idx = row + w
+            while idx < end_idx:
+                used8[fbuf8[idx]] = 1
+                idx += 1
+            row += self_width
+        return used
+
+
+    @micropython.viper
+    def _remap_rect8(self, x:int, y:int, w:int, h:int, lut):
+        """Replace each pixel in a (clipped) area of the 8-bit framebuffer using a lookup table."""
+        fbuf8 = ptr8(self.fbuf)
+        lut8 = ptr8(lut)
+        self_width = int(self.width)
+
+        row = y * self_width + x
+        end_row = row + h * self_width
+        while row < end_row:
+            idx = row
+            end_idx = row + w
+            while idx < end_idx:
+                fbuf8[idx] = lut8[fbuf8[idx]]
+                idx += 1
+            row += self_width
+
+
+    @micropython.viper
+    def _remap_rect(self, x:int, y:int, w:int, h:int, lut):
+        """Replace each pixel in a (clipped) area of the 4-bit framebuffer using a byte lookup table."""
+        fbuf8 = ptr8(self.fbuf)
+        lut8 = ptr8(lut)
+        row_bytes = (int(self.width) + 1) >> 1
+
+        row = y * row_bytes
+        end_row = row + h * row_bytes
+        while row < end_row:
+            idx = row + (x >> 1)
+            length = w
+            if x & 1:
+                # the first pixel is in the low nibble
+                fbuf8[idx] = (fbuf8[idx] & 0xf0) | (lut8[fbuf8[idx]] & 0x0f)
+                idx += 1
+                length -= 1
+
+            # two pixels at a time
+            end_idx = idx + (length >> 1)
+            while idx < end_idx:
+                fbuf8[idx] = lut8[fbuf8[idx]]
+                idx += 1
+
+            if length & 1:
+                # the last pixel is in the high nibble
+                fbuf8[idx] = (lut8[fbuf8[idx]] & 0xf0) | (fbuf8[idx] & 0x0f)
+            row += row_bytes
+
+
     def scroll(self, xstep: int, ystep: int):
         """Shift the contents of the FrameBuffer by the given vector.
 
@@ -305,10 +855,96 @@ class DisplayCore:
             xstep (int): Distance to move fbuf to the right
             ystep (int): Distance to move fbuf down
         """
-        self._set_show_y(0, self.height)
+        self._set_show_area(0, 0, self.width, self.height)
         self.fbuf.scroll(xstep,ystep)
 
 
+    def set_scroll_area(self, top: int = 0, bottom: int = 0):
+        """Set the area of the display that is moved by `scroll_lines`.
+
+        Args:
+            top (int): The number of fixed (unscrolled) rows at the top of the display.
+            bottom (int): The number of fixed (unscrolled) rows at the bottom of the display.
+        """
+        self._scroll_top = top
+        self._scroll_fixed_bottom = bottom
+
+
+    def scroll_lines(self, lines: int):
+        """Scroll the rows in the scroll area (see `set_scroll_area`) up by the given number of rows.
+
+        Negative values scroll down.
+        Rows exposed by the scroll keep their old contents, and should be redrawn by the caller.
+
+        When the display driver supports hardware scrolling,
+        the display itself is scrolled, and only the exposed rows need to be sent to the display.
+        Otherwise, the entire scroll area is sent when `show` is called.
+        """
+        top = self._scroll_top
+        bottom = self.height - self._scroll_fixed_bottom
+        if lines == 0 or bottom <= top:
+            return
+        lines = max(-(bottom - top), min(bottom - top, lines))
+
+        hardware = self._can_hw_scroll()
+        if hardware:
+            # the panel's rows move when it is scrolled,
+            # so anything already drawn must be sent before scrolling.
+            self._flush_before_scroll()
+
+        self._shift_rows(self.fbuf, top, bottom, lines)
+        if self.skip_unchanged_rows:
+            self.invalidate_row_hashes()
+
+        if hardware:
+            self._hw_scroll(lines)
+            # only the newly exposed rows need to be sent
+            if lines > 0:
+                self._set_show_area(0, bottom - lines, self.width, bottom)
+            else:
+                self._set_show_area(0, top, self.width, top - lines)
+        else:
+            self._set_show_area(0, top, self.width, bottom)
+
+
+    def _shift_rows(self, fbuf, top: int, bottom: int, lines: int):
+        """Move the framebuffer rows between top and bottom up by `lines` rows (or down, if `lines` is negative).
+
+        Rows are copied one at a time (so that the source and destination of each copy never overlap),
+        in an order that never overwrites a row before it has been moved.
+        """
+        row_bytes = self._bytes_per_row(self.width)
+        buf = memoryview(fbuf)
+        if lines > 0:
+            # moving up, so start from the top
+            dest = top
+            end = bottom - lines
+            step = 1
+        else:
+            # moving down, so start from the bottom
+            dest = bottom - 1
+            end = top - lines - 1
+            step = -1
+        while dest != end:
+            start = dest * row_bytes
+            src = (dest + lines) * row_bytes
+            buf[start : start + row_bytes] = buf[src : src + row_bytes]
+            dest += step
+
+
+    def _can_hw_scroll(self) -> bool:
+        """Check if the display driver can scroll the display itself."""
+        return False
+
+
+    def _flush_before_scroll(self):
+        """Send any pending changes to the display (before it is scrolled)."""
+
+
+    def _hw_scroll(self, lines: int):
+        """Scroll the display itself (implemented by display drivers that support it)."""
+
+
 
 
     # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ Text Drawing: ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
@@ -325,16 +961,38 @@ class DisplayCore:
             color (int): encoded color to use for text
             font (optional): bitmap font module to use
         """
+        self._draw_text(text, x, y - self._band_y, color, font)
+
+
+    def _draw_text(self, text: str, x: int, y: int, color: int, font):
+        """Draw text at the given framebuffer coordinates."""
         color = self._format_color(color)
 
+        # UTF8 glyphs are drawn starting one row above `y`, so the area includes that row too.
         if font:
-            self._set_show_y(y, y + font.HEIGHT)
+            self._set_show_area(x, y - 1, x + self._get_total_width(text, font), y + font.HEIGHT)
             self._bitmap_text(font, text, x, y, color)
         else:
-            self._set_show_y(y, y + 8)
+            self._set_show_area(x, y - 1, x + len(text) * 8, y + 8)
             self._utf8_text(text, x, y, color)
 
 
+    def cached_text(self, text: str, x: int, y: int, color: int, font=None):
+        """Draw text to the framebuffer, using a cached, pre-rendered copy of the text.
+
+        This works the same as `text`, but is much faster for text that is drawn repeatedly (like labels).
+        The rendered text is stored in `text_cache`, and reused for any color.
+
+        Args:
+            text (str): text to write
+            x (int): column to start drawing at
+            y (int): row to start drawing at
+            color (int): encoded color to use for text
+            font (optional): bitmap font module to use
+        """
+        self.text_cache.text(text, x, y - self._band_y, color, font=font)
+
+
     @micropython.viper
     def _bitmap_text(self, font, text, x:int, y:int, color:int):
         """Quickly draw a text with a bitmap font using viper.
@@ -344,7 +1002,7 @@ class DisplayCore:
         width = int(font.WIDTH)
         height = int(font.HEIGHT)
         self_width = int(self.width)
-        self_height = int(self.height)
+        self_height = int(self._fbuf_height)
 
         utf8_scale = height // 8
 
@@ -360,14 +1018,92 @@ class DisplayCore:
         last = int(font.LAST)
 
         use_tiny_fbuf = bool(self.use_tiny_buf)
+        use_gs8 = bool(self.use_gs8_buf)
         fbuf16 = ptr16(self.fbuf)
         fbuf8 = ptr8(self.fbuf)
+        # 4-bit rows are padded to a whole byte
+        row_bytes4 = (self_width + 1) >> 1
+        color_hi = color << 4
+        color_pair = color_hi | color
+
+        # Fonts with a width that is a multiple of 8 (like the 8x16 and 16x32 VGA fonts)
+        # store each glyph row in whole bytes, so they can be drawn a byte at a time.
+        row_bytes = width // 8 if width % 8 == 0 else 0
+        char_bytes = row_bytes * height
+        # every glyph is on the same rows, so the rows only need to be clipped once.
+        row_start = 0 if y >= 0 else -y
+        row_end = height if (y + height) <= self_height else self_height - y
 
         for char in text:
             ch_idx = int(ord(char))
 
             # only draw chars that exist in font
-            if first <= ch_idx < last:
+            if first <= ch_idx < last and row_bytes:
+                # clip the glyph columns once
+                col_start = 0 if x >= 0 else -x
+                col_end = width if (x + width) <= self_width else self_width - x
+                clip_x = col_start > 0 or col_end < width
+
+                glyph_idx = (ch_idx - first) * char_bytes + row_start * row_bytes
+                if use_tiny_fbuf:
+                    target_row = (y + row_start) * row_bytes4
+                else:
+                    target_row = (y + row_start) * self_width + x
+                row = row_start
+                while row < row_end and col_start < col_end:
+                    byte_x = 0
+                    while byte_x < width:
+                        byte = int(glyphs[glyph_idx])
+                        glyph_idx += 1
+
+                        if clip_x:
+                            # mask off the bits that are outside the display
+                            if byte_x < col_start:
+                                shift = col_start - byte_x
+                                byte &= 0xff >> (shift if shift < 8 else 8)
+                            if byte_x + 8 > col_end:
+                                shift = byte_x + 8 - col_end
+                                byte &= (0xff << (shift if shift < 8 else 8)) & 0xff
+
+                        if use_tiny_fbuf:
+                            # write two pixels (one byte) at a time
+                            px_x = x + byte_x
+                            target_idx = target_row + (px_x >> 1)
+                            # line the glyph bits up with the nibbles of the target bytes
+                            pairs = byte << 7 if px_x & 1 else byte << 8
+                            while pairs:
+                                pair = (pairs >> 14) & 0x3
+                                if pair == 0x3:
+                                    fbuf8[target_idx] = color_pair
+                                elif pair == 0x2:
+                                    fbuf8[target_idx] = (fbuf8[target_idx] & 0x0f) | color_hi
+                                elif pair == 0x1:
+                                    fbuf8[target_idx] = (fbuf8[target_idx] & 0xf0) | color
+                                pairs = (pairs << 2) & 0xffff
+                                target_idx += 1
+                        elif use_gs8:
+                            # skip empty bits, and stop once the rest of the byte is empty
+                            target_px = target_row + byte_x
+                            while byte:
+                                if byte & 0x80:
+                                    fbuf8[target_px] = color
+                                byte = (byte << 1) & 0xff
+                                target_px += 1
+                        else:
+                            # skip empty bits, and stop once the rest of the byte is empty
+                            target_px = target_row + byte_x
+                            while byte:
+                                if byte & 0x80:
+                                    fbuf16[target_px] = color
+                                byte = (byte << 1) & 0xff
+                                target_px += 1
+
+                        byte_x += 8
+                    target_row += row_bytes4 if use_tiny_fbuf else self_width
+                    row += 1
+                x += width
+
+            elif first <= ch_idx < last:
                 bit_start = (ch_idx - first) * char_px_len
 
                 px_idx = 0
@@ -382,21 +1118,21 @@ class DisplayCore:
                     if ((glyphs[byte_idx] >> shift_amount) & 0x1) == 1 \
                     and 0 <= target_x < self_width \
                     and 0 <= target_y < self_height:
-                        target_px = (target_y * self_width) + target_x
-
                         # I tried putting this if/else before px loop,
                         # surprisingly, there was not a noticable speed difference,
                         # and the code was harder to read. So, I put it back.
                         if use_tiny_fbuf:
                             # pack 4 bits into 8 bit ptr
-                            target_idx = target_px // 2
-                            dest_shift = ((target_px + 1) % 2) * 4
-                            dest_mask = 0xf0 >> dest_shift
-                            fbuf8[target_idx] = (fbuf8[target_idx] & dest_mask) | (color << dest_shift)
+                            target_idx = target_y * row_bytes4 + (target_x >> 1)
+                            if target_x & 1:
+                                fbuf8[target_idx] = (fbuf8[target_idx] & 0xf0) | color
+                            else:
+                                fbuf8[target_idx] = (fbuf8[target_idx] & 0x0f) | color_hi
+                        elif use_gs8:
+                            fbuf8[(target_y * self_width) + target_x] = color
                         else:
                             # draw to 16 bits
-                            target_idx = target_px
-                            fbuf16[target_idx] = color
+                            fbuf16[(target_y * self_width) + target_x] = color
 
                     px_idx += 1
                 x += width
@@ -420,38 +1156,84 @@ class DisplayCore:
 
         # set up viper variables
         use_tiny_fbuf = bool(self.use_tiny_buf)
-        fbuf16 = ptr16(self.fbuf)
+        use_gs8 = bool(self.use_gs8_buf)
         fbuf8 = ptr8(self.fbuf)
+        fbuf16 = ptr16(self.fbuf)
         self_width = int(self.width)
-        self_height = int(self.height)
-
-        # calculate the offset in the binary data
-        offset = char * 8
+        self_height = int(self._fbuf_height)
 
         # mh_if frozen:
         # # Read the font data directly from the memoryview
         # cur = ptr8(utf8)
+        # offset = int(self._utf8_offset(utf8, char))
+        # if offset < 0:
+        #     # glyph isn't in the font
+        #     return width * scale
         # mh_else:
-        # seek to offset and read 8 bytes
-        self.utf8_font.seek(offset)
-        cur = ptr8(self.utf8_font.read(8))
+        # get the glyph from the cache (reading it from the font file if needed)
+        cur = ptr8(self._glyph_slab)
+        offset = int(self._get_glyph(char))
         # mh_end_if
 
         # y axis is inverted - we start from bottom not top
         y += (height - 1) * scale - 1
 
+        if use_tiny_fbuf or use_gs8:
+            # draw each run of set pixels in a glyph row as a single span
+            row_bytes = self_width if use_gs8 else (self_width + 1) >> 1
+            # glyph columns (in pixels) that are on the display
+            col_start = 0 if x >= 0 else -x
+            col_end = width * scale if (x + width * scale) <= self_width else self_width - x
+            row = 0
+            while row < height:
+                # glyph rows are stored LSB first (and 4 pixel wide glyphs store two rows per byte)
+                if width == 8:
+                    src = int(cur[offset + row])
+                else:
+                    src = (int(cur[offset + (row >> 1)]) >> ((row & 1) * 4)) & 0xf
+                target_y = y - row * scale
+
+                col = 0
+                while src:
+                    if src & 1:
+                        run_start = col
+                        while src & 1:
+                            src >>= 1
+                            col += 1
+                        px_start = run_start * scale
+                        px_end = col * scale
+                        if px_start < col_start:
+                            px_start = col_start
+                        if px_end > col_end:
+                            px_end = col_end
+                        if px_start < px_end:
+                            ysize = 0
+                            while ysize < scale:
+                                if 0 <= (target_y + ysize) < self_height:
+                                    row_idx = (target_y + ysize) * row_bytes
+                                    if use_gs8:
+                                        idx = row_idx + x + px_start
+                                        end_idx = row_idx + x + px_end
+                                        while idx < end_idx:
+                                            fbuf8[idx] = color
+                                            idx += 1
+                                    else:
+                                        self._nibble_span(self.fbuf, row_idx, x + px_start, px_end - px_start, color)
+                                ysize += 1
+                    else:
+                        src >>= 1
+                        col += 1
+                row += 1
+            return width * scale
+
         # iterate over every character pixel
         px_idx = 0
         max_px_idx = width * height
         while px_idx < max_px_idx:
             # which byte to fetch from the ptr8,
             # and how far to shift (to get 1 bit)
-            ptr_idx = px_idx // 8
+            ptr_idx = px_idx // 8 + offset
             shft_idx = px_idx % 8
-            # mh_if frozen:
-            # # if reading from memoryview, add offset now
-            # ptr_idx += offset
-            # mh_end_if
 
             # calculate x/y position from pixel index
             target_x = x + ((px_idx % width) * scale)
@@ -465,19 +1247,10 @@ class DisplayCore:
                     xsize = scale_idx % scale
                     ysize = scale_idx // scale
 
-                    target_px = ((target_y + ysize) * self_width) + target_x + xsize
                     if 0 <= (target_x + xsize) < self_width \
                     and 0 <= (target_y + ysize) < self_height:
-                        if use_tiny_fbuf:
-                            # pack 4 bits into 8 bit ptr
-                            target_idx = target_px // 2
-                            dest_shift = ((target_px + 1) % 2) * 4
-                            dest_mask = 0xf0 >> dest_shift
-                            fbuf8[target_idx] = (fbuf8[target_idx] & dest_mask) | (color << dest_shift)
-                        else:
-                            # draw to 16 bits
-                            target_idx = target_px
-                            fbuf16[target_idx] = color
+                        # draw to 16 bits
+                        fbuf16[((target_y + ysize) * self_width) + target_x + xsize] = color
                     scale_idx += 1
             px_idx += 1
 
@@ -485,6 +1258,118 @@ class DisplayCore:
         return width * scale
 
 
+    @staticmethod
+    @micropython.viper
+    def _nibble_span(buf, row_idx:int, x:int, length:int, color:int):
+        """Fill a horizontal span of 4-bit pixels, starting at the given byte offset of a row.
+
+        Whole bytes (two pixels) are written at once, and only the ragged edges are masked.
+        """
+        buf8 = ptr8(buf)
+        idx = row_idx + (x >> 1)
+        if x & 1:
+            # the first pixel is in the low nibble
+            buf8[idx] = (buf8[idx] & 0xf0) | color
+            idx += 1
+            length -= 1
+
+        color_pair = (color << 4) | color
+        end_idx = idx + (length >> 1)
+        while idx < end_idx:
+            buf8[idx] = color_pair
+            idx += 1
+
+        if length & 1:
+            # the last pixel is in the high nibble
+            buf8[idx] = (buf8[idx] & 0x0f) | (color << 4)
+
+
+    # mh_if not frozen:
+    @micropython.viper
+    def _get_glyph(self, char:int) -> int:
+        """Find a glyph in the glyph cache, loading it if needed.
+
+        Returns the offset of the glyph in `_glyph_slab`.
+        """
+        keys = ptr32(self._glyph_keys)
+        refs = ptr8(self._glyph_refs)
+        size = int(self._glyph_cache_size)
+
+        idx = 0
+        while idx < size:
+            if int(keys[idx]) == char:
+                refs[idx] = 1
+                self.glyph_hits = int(self.glyph_hits) + 1
+                return idx * 8
+            idx += 1
+
+        # cache miss; advance the clock hand past recently used slots
+        hand = int(self._glyph_hand)
+        while refs[hand]:
+            refs[hand] = 0
+            hand = (hand + 1) % size
+
+        keys[hand] = char
+        refs[hand] = 1
+        self._glyph_hand = (hand + 1) % size
+        self.glyph_misses = int(self.glyph_misses) + 1
+        self._load_glyph(hand, char)
+        return hand * 8
+
+
+    def _load_glyph(self, slot: int, char: int):
+        """Read the glyph for `char` from the utf8 font, into the given cache slot."""
+        offset = self._utf8_offset(self._utf8_index, char)
+        if offset < 0:
+            # glyph isn't in the font, so it is drawn blank.
+            self._glyph_view[slot * 8 : slot * 8 + 8] = bytes(8)
+            return
+        self.utf8_font.seek(offset)
+        self.utf8_font.readinto(self._glyph_view[slot * 8 : slot * 8 + 8])
+
+
+    def _load_utf8_index(self):
+        """Read the header (and code point index, for subset fonts) of the utf8 font file."""
+        header = self.utf8_font.read(8)
+        if header[:4] == b'MHU8':
+            count = header[4] | (header[5] << 8)
+            header += self.utf8_font.read(count * 2)
+        self._utf8_index = header
+    # mh_end_if
+
+
+    @staticmethod
+    @micropython.viper
+    def _utf8_offset(font, char:int) -> int:
+        """Find the byte offset of a glyph in the utf8 font, or -1 if the font doesn't contain it.
+
+        The full utf8 font contains every glyph from 0x0000 to 0xFFFF.
+        Subset fonts (made with 'tools/utf8_util/build_font_subset.py') start with b'MHU8',
+        followed by a glyph count, and a sorted index of code points. Glyphs are found using a binary search.
+        'font' only needs to contain the font header and index.
+        """
+        header = ptr8(font)
+        if not (header[0] == 0x4d and header[1] == 0x48 and header[2] == 0x55 and header[3] == 0x38):
+            # full font
+            return char * 8
+
+        count = int(header[4]) | (int(header[5]) << 8)
+        # code points start after the 8 byte header
+        index = ptr16(font)
+        low = 0
+        high = count - 1
+        while low <= high:
+            mid = (low + high) >> 1
+            code = int(index[4 + mid])
+            if code == char:
+                return 8 + count * 2 + mid * 8
+            if code < char:
+                low = mid + 1
+            else:
+                high = mid - 1
+        return -1
+
+
     @micropython.viper
     def _utf8_text(self, text, x:int, y:int, color:int):
         """Draw text, including utf8 characters."""
@@ -559,8 +1444,11 @@ class DisplayCore:
             index (int): Optional index of bitmap to draw from multiple bitmap
                 module
             key (int): colors that match the key will be transparent.
+            palette (list[int]|None): Colors to use instead of the bitmap's palette.
+                (With `use_gs8_buf`, an 8 bit bitmap drawn with `palette=range(256)` is copied directly.)
         """
-        if self.width <= x or self.height <= y:
+        y -= self._band_y
+        if self.width <= x or self._fbuf_height <= y:
             return
 
         if palette is None:
@@ -580,12 +1468,13 @@ class DisplayCore:
     @micropython.viper
     def _bitmap(self, bitmap, x:int, y:int, draw_width:int, draw_height:int, index:int, key:int, palette):
         # Update drawn pixel area:
-        self._set_show_y(y, y + draw_height)
+        self._set_show_area(x, y, x + draw_width, y + draw_height)
 
         # Get values for our display:
         display_width = int(self.width)
-        display_height = int(self.height)
+        display_height = int(self._fbuf_height)
         use_tiny_buf = bool(self.use_tiny_buf)
+        use_gs8 = bool(self.use_gs8_buf)
 
         # Get values for our bitmap:
         btmp_width = int(bitmap.WIDTH)
@@ -597,12 +1486,19 @@ class DisplayCore:
         # and convert palette into a pointer (for speed!)
         palette_len = int(len(palette))
         palette_ptr = ptr16(bytearray(palette_len * 2))
+        # An unscaled 8 bit bitmap whose palette maps each value to itself
+        # can be copied straight into an 8 bit framebuffer.
+        direct_copy = use_gs8 and bpp == 8 and draw_width == btmp_width and draw_height == btmp_height
         for i in range(palette_len):
             palette_ptr[i] = int(
                 self._format_color(palette[i])
                 )
+            if int(palette_ptr[i]) != i:
+                direct_copy = False
         # also format the key color
         key = int(self._format_color(key))
+        if 0 <= key < palette_len:
+            direct_copy = False
 
         # Pointers for the bitmap, and destination buffers
         bitmap_ptr = ptr8(bitmap.BITMAP)
@@ -624,6 +1520,19 @@ class DisplayCore:
         y_idx_end = y + draw_height
         y_idx_end = 0 if y_idx_end < 0 else display_height if y_idx_end > display_height else y_idx_end
 
+        if direct_copy:
+            src_start = starting_bit // 8 + (x_idx_start - x)
+            while y_idx < y_idx_end:
+                src_idx = src_start + (y_idx - y) * btmp_width
+                target_idx = y_idx * display_width + x_idx_start
+                target_end = y_idx * display_width + x_idx_end
+                while target_idx < target_end:
+                    fbuf8[target_idx] = bitmap_ptr[src_idx]
+                    src_idx += 1
+                    target_idx += 1
+                y_idx += 1
+            return
+
         # Iterate vertically over each row:
         # (Using a while loop like this is faster than using range)
         while y_idx < y_idx_end:
@@ -638,15 +1547,20 @@ class DisplayCore:
 
                 # Find the start bit for the pixel we want
                 btmp_bit_idx = starting_bit + (btmp_y*btmp_width + btmp_x) * bpp
-                # calculate the byte, and byte shift needed to read that bit
+                # calculate the byte, and byte shift needed to read the pixel (MSB first)
                 btmp_byte_idx = btmp_bit_idx // 8
-                byte_shift = 7 - (btmp_bit_idx % 8)
+                byte_shift = 8 - bpp - (btmp_bit_idx % 8)
+
+                # Read bitmap value
+                if byte_shift < 0:
+                    # this pixel continues into the next byte
+                    value = (bitmap_ptr[btmp_byte_idx] << 8) | bitmap_ptr[btmp_byte_idx + 1]
+                    value >>= byte_shift + 8
+                else:
+                    value = bitmap_ptr[btmp_byte_idx] >> byte_shift
 
                 # Find pixel color from bitmap value
-                clr = palette_ptr[
-                    # Read bitmap value
-                    (bitmap_ptr[btmp_byte_idx] >> byte_shift) & bitmask
-                ]
+                clr = palette_ptr[value & bitmask]
 
                 # Don't draw the keyed-out value
                 if clr != key:
@@ -663,9 +1577,113 @@ class DisplayCore:
                         # bitwise OR the new 4 bits into the target byte
                         fbuf8[target_idx] = (fbuf8[target_idx] & dest_mask) | (clr << dest_shift)
 
+                    elif use_gs8:
+                        fbuf8[target_px] = clr
+
                     else:
                         # writing 16-bit pixels is easy with a 16-bit pointer.
                         fbuf16[target_px] = clr
 
                 x_idx += 1
             y_idx+=1
+
+
+    def draw_batch(self, atlas, sprites, count: int|None = None):
+        """Draw many sprites from a SpriteAtlas at once.
+
+        Args:
+            atlas (SpriteAtlas): The atlas containing the sprites to draw.
+            sprites (array.array):
+                A flat array('h') of (index, x, y) values, one set for each sprite to draw.
+            count (int|None): The number of sprites to draw (defaults to all sprites in `sprites`).
+        """
+        max_count = len(sprites) // 3
+        count = max_count if count is None else min(count, max_count)
+        palette, key = atlas.formatted_palette(self)
+        self._draw_batch(atlas.pixels, atlas.offsets, atlas.frames, palette, key, sprites, count, self._band_y)
+
+
+    @micropython.viper
+    def _draw_batch(self, pixels, offsets, frames, palette, key:int, sprites, count:int, band_y:int):
+        """Draw each sprite in the batch, using shared setup and per-sprite clipping."""
+        display_width = int(self.width)
+        display_height = int(self._fbuf_height)
+        use_tiny_buf = bool(self.use_tiny_buf)
+        use_gs8 = bool(self.use_gs8_buf)
+        fbuf8 = ptr8(self.fbuf)
+        fbuf16 = ptr16(self.fbuf)
+
+        px_ptr = ptr8(pixels)
+        offset_ptr = ptr32(offsets)
+        frame_ptr = ptr16(frames)
+        palette_ptr = ptr16(palette)
+        sprite_ptr = ptr16(sprites)
+        num_frames = int(len(offsets))
+
+        sprite_idx = 0
+        while sprite_idx < count:
+            index = int(sprite_ptr[sprite_idx * 3])
+            x = int(sprite_ptr[sprite_idx * 3 + 1])
+            y = int(sprite_ptr[sprite_idx * 3 + 2])
+            sprite_idx += 1
+            # sign extend the signed 16 bit values
+            if x & 0x8000:
+                x -= 0x10000
+            if y & 0x8000:
+                y -= 0x10000
+            y -= band_y
+
+            if index >= num_frames:
+                continue
+
+            # position and size of the trimmed sprite
+            frame = index * 4
+            width = int(frame_ptr[frame + 2])
+            height = int(frame_ptr[frame + 3])
+            x += int(frame_ptr[frame])
+            y += int(frame_ptr[frame + 1])
+
+            # skip sprites that are empty or off screen
+            if width == 0 \
+            or x >= display_width or y >= display_height \
+            or x + width <= 0 or y + height <= 0:
+                continue
+
+            # clip once per sprite
+            col_start = 0 if x >= 0 else -x
+            col_end = width if x + width <= display_width else display_width - x
+            row = 0 if y >= 0 else -y
+            row_end = height if y + height <= display_height else display_height - y
+
+            self._set_show_area(x + col_start, y + row, x + col_end, y + row_end)
+
+            src_row = int(offset_ptr[index]) + row * width
+            dest_row = (y + row) * display_width + x
+            while row < row_end:
+                col = col_start
+                if use_tiny_buf:
+                    while col < col_end:
+                        clr = int(palette_ptr[px_ptr[src_row + col]])
+                        if clr != key:
+                            target_px = dest_row + col
+                            target_idx = target_px >> 1
+                            if target_px & 1:
+                                fbuf8[target_idx] = (fbuf8[target_idx] & 0xf0) | clr
+                            else:
+                                fbuf8[target_idx] = (fbuf8[target_idx] & 0x0f) | (clr << 4)
+                        col += 1
+                elif use_gs8:
+                    while col < col_end:
+                        clr = int(palette_ptr[px_ptr[src_row + col]])
+                        if clr != key:
+                            fbuf8[dest_row + col] = clr
+                        col += 1
+                else:
+                    while col < col_end:
+                        clr = int(palette_ptr[px_ptr[src_row + col]])
+                        if clr != key:
+                            fbuf16[dest_row + col] = clr
+                        col += 1
+                src_row += width
+                dest_row += display_width
+                row += 1
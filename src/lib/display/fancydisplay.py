@@ -9,6 +9,24 @@ import array
 from math import cos, floor, pi, sin, sqrt
 
 from . import Display
+from lib.hydra.color import mix
+
+
+# Transforms use Q12 fixed-point math (4096 == 1.0)
+_FIXED_SHIFT = const(12)
+_FIXED_ONE = const(4096)
+_FIXED_HALF = const(2048)
+
+# Integer angles are "binary angles", with 1024 steps per full turn
+_ANGLE_STEPS = const(1024)
+_ANGLE_MASK = const(1023)
+_QUARTER_TURN = const(256)
+
+# number of values per shape in `draw_polygons`
+_SHAPE_FIELDS = const(6)
+
+# Q12 sine of each angle step
+_SIN_TABLE = array.array('h', (round(sin(i * 2 * pi / _ANGLE_STEPS) * _FIXED_ONE) for i in range(_ANGLE_STEPS)))
 
 
 def ease_in_out_sine(x: float) -> float:
@@ -23,9 +41,36 @@ def ease_in_out_circ(x: float) -> float:
     return (sqrt(1 - pow(-2 * x + 2, 2)) + 1) / 2
 
 
+def _short_points(points) -> array.array:
+    """Get the points as an array('h'), converting lists and other array types (which viper can't read as 'h')."""
+    if isinstance(points, array.array):
+        # (MicroPython arrays may not have a `typecode`, so check the item size instead)
+        typecode = getattr(points, 'typecode', None)
+        if typecode == 'h' or (typecode is None and memoryview(points).itemsize == 2):
+            return points
+    # (int() also accepts float coordinates)
+    return array.array('h', [int(point) for point in points])
+
+
 
 class FancyDisplay(Display):
-    """An extended Display class."""
+    """An extended Display class.
+
+    Polygons are transformed with integer (Q12 fixed-point) math, using a sine lookup table,
+    and reusable scratch arrays, so that drawing many transformed polygons each frame creates very little garbage.
+    """
+
+    # reusable arrays for transformed points (keyed by length)
+    _scratch = {}
+    # (min x, min y, max x, max y) of the last transformed points
+    _bounds = array.array('h', bytes(8))
+
+
+    @staticmethod
+    def angle_step(angle: float) -> int:
+        """Convert an angle in radians to an integer angle (1024 steps per turn), as used by `draw_polygons`."""
+        return round(angle * _ANGLE_STEPS / (2 * pi)) & _ANGLE_MASK
+
 
     @micropython.viper
     @staticmethod
@@ -36,8 +81,12 @@ class FancyDisplay(Display):
 
         idx = 0
         while idx < points_len:
+            point = int(point_ptr[idx])
+            # sign extend the signed 16 bit value
+            if point & 0x8000:
+                point -= 0x10000
             # scale using integer math for speed
-            point_ptr[idx] = (point_ptr[idx] * scale_pct) // 100
+            point_ptr[idx] = (point * scale_pct) // 100
             idx += 1
 
 
@@ -45,20 +94,77 @@ class FancyDisplay(Display):
     def rotate_points(points, angle=0, center_x=0, center_y=0) -> array.array:
         """Rotate all the points in the array, return resulting array."""
         if angle:
-            cos_a = cos(angle)
-            sin_a = sin(angle)
-            rotated = array.array('h')
-            for i in range(0, len(points), 2):
-                rotated.append(
-                    center_x + floor((points[i] - center_x) * cos_a - (points[i+1] - center_y) * sin_a)
-                )
-                rotated.append(
-                    center_y + floor((points[i] - center_x) * sin_a + (points[i+1] - center_y) * cos_a)
+            step = FancyDisplay.angle_step(angle)
+            cos_a = _SIN_TABLE[(step + _QUARTER_TURN) & _ANGLE_MASK]
+            sin_a = _SIN_TABLE[step]
+            # copy into a new array('h') (which also accepts lists, or other array types),
+            # then transform it in place
+            rotated = array.array('h', points)
+            FancyDisplay._transform_points(
+                rotated,
+                rotated,
+                cos_a,
+                sin_a,
+                center_x - ((center_x * cos_a - center_y * sin_a + _FIXED_HALF) >> _FIXED_SHIFT),
+                center_y - ((center_x * sin_a + center_y * cos_a + _FIXED_HALF) >> _FIXED_SHIFT),
+                FancyDisplay._bounds,
                 )
             return rotated
         return points
 
 
+    @micropython.viper
+    @staticmethod
+    def _transform_points(src, dst, cos_s:int, sin_s:int, tx:int, ty:int, bounds):
+        """Scale, rotate, and translate each point in `src`, writing the results to `dst`.
+
+        `cos_s` and `sin_s` are the Q12 cosine and sine of the angle, multiplied by the scale.
+        The points are rotated around (0, 0), then moved by `tx`, `ty`.
+        The (min x, min y, max x, max y) of the results are written to `bounds`.
+        `src` and `dst` must be array('h'), and can be the same array.
+        """
+        src_ptr = ptr16(src)
+        dst_ptr = ptr16(dst)
+        bounds_ptr = ptr16(bounds)
+        # (ignore an unpaired last value)
+        points_len = int(len(dst)) & ~1
+
+        min_x = 0x7fff
+        min_y = 0x7fff
+        max_x = -0x8000
+        max_y = -0x8000
+
+        idx = 0
+        while idx < points_len:
+            x = int(src_ptr[idx])
+            y = int(src_ptr[idx + 1])
+            # sign extend the signed 16 bit values
+            if x & 0x8000:
+                x -= 0x10000
+            if y & 0x8000:
+                y -= 0x10000
+
+            new_x = ((x * cos_s - y * sin_s + _FIXED_HALF) >> _FIXED_SHIFT) + tx
+            new_y = ((x * sin_s + y * cos_s + _FIXED_HALF) >> _FIXED_SHIFT) + ty
+            dst_ptr[idx] = new_x
+            dst_ptr[idx + 1] = new_y
+
+            if new_x < min_x:
+                min_x = new_x
+            if new_x > max_x:
+                max_x = new_x
+            if new_y < min_y:
+                min_y = new_y
+            if new_y > max_y:
+                max_y = new_y
+            idx += 2
+
+        bounds_ptr[0] = min_x
+        bounds_ptr[1] = min_y
+        bounds_ptr[2] = max_x
+        bounds_ptr[3] = max_y
+
+
     @staticmethod
     def warp_points(
             points,
@@ -170,6 +276,24 @@ class FancyDisplay(Display):
         if angle == 0 and scale == 1.0 and warp == None:
             super().polygon(points, x, y, color, fill=fill)
 
+        # scaled/rotated polygon (using the fixed-point transform)
+        elif warp is None:
+            points = _short_points(points)
+            scale = int(scale * _FIXED_ONE)
+            if center_x is None:
+                center_x = (max(points) * scale >> _FIXED_SHIFT) // 2
+            if center_y is None:
+                center_y = (max(points) * scale >> _FIXED_SHIFT) // 2
+            step = self.angle_step(angle)
+            cos_a = _SIN_TABLE[(step + _QUARTER_TURN) & _ANGLE_MASK]
+            sin_a = _SIN_TABLE[step]
+            # rotate around the center point (rather than 0, 0)
+            x += center_x - ((center_x * cos_a - center_y * sin_a + _FIXED_HALF) >> _FIXED_SHIFT)
+            y += center_y - ((center_x * sin_a + center_y * cos_a + _FIXED_HALF) >> _FIXED_SHIFT)
+            self._transformed_polygon(
+                points, x, y, color, (cos_a * scale) >> _FIXED_SHIFT, (sin_a * scale) >> _FIXED_SHIFT, fill,
+                )
+
         #complex polygon
         else:
             #clone array so we don't modify original
@@ -193,3 +317,59 @@ class FancyDisplay(Display):
 
             super().polygon(points, x, y, color, fill=fill)
 
+
+    def draw_polygons(self, polygons: list, shapes: array.array, count: int|None = None, *, fill: bool = False):
+        """Draw many scaled and rotated polygons at once.
+
+        Each polygon is scaled and rotated around its (0, 0) point, then drawn at the given position.
+        This uses only integer math, and doesn't allocate any new arrays (after the first frame),
+        so it's suitable for drawing hundreds of points every frame.
+
+        Args:
+            polygons (list[array('h')]): The polygons that the shapes can use.
+            shapes (array.array):
+                A flat array('i') of (index, x, y, angle, scale, color) values, one set for each shape to draw.
+                `index` is the index of the polygon in `polygons`,
+                `angle` is an integer angle (1024 steps per full turn, see `angle_step`),
+                and `scale` is a percentage.
+            count (int|None): The number of shapes to draw (defaults to all shapes in `shapes`).
+            fill (bool): Fill the polygons (or draw their outlines).
+        """
+        max_count = len(shapes) // _SHAPE_FIELDS
+        count = max_count if count is None else min(count, max_count)
+        sin_table = _SIN_TABLE
+
+        idx = 0
+        end = count * _SHAPE_FIELDS
+        while idx < end:
+            step = shapes[idx + 3] & _ANGLE_MASK
+            scale = shapes[idx + 4] * _FIXED_ONE // 100
+            self._transformed_polygon(
+                polygons[shapes[idx]],
+                shapes[idx + 1],
+                shapes[idx + 2],
+                shapes[idx + 5],
+                (sin_table[(step + _QUARTER_TURN) & _ANGLE_MASK] * scale) >> _FIXED_SHIFT,
+                (sin_table[step] * scale) >> _FIXED_SHIFT,
+                fill,
+                )
+            idx += _SHAPE_FIELDS
+
+
+    def _transformed_polygon(self, points, x: int, y: int, color: int, cos_s: int, sin_s: int, fill: bool):
+        """Transform the points into a scratch array, and draw the result."""
+        points = _short_points(points)
+        points_len = len(points)
+        if points_len < 2:
+            return
+        scratch = self._scratch.get(points_len)
+        if scratch is None:
+            scratch = array.array('h', bytes(points_len * 2))
+            self._scratch[points_len] = scratch
+
+        bounds = self._bounds
+        self._transform_points(points, scratch, cos_s, sin_s, 0, 0, bounds)
+
+        y -= self._band_y
+        self._set_show_area(x + bounds[0], y + bounds[1], x + bounds[2] + 1, y + bounds[3] + 1)
+        self.fbuf.poly(x, y, scratch, self._format_color(color), fill)
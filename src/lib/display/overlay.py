@@ -0,0 +1,94 @@
+"""Overlays are graphics drawn over top of an app's graphics, each time `Display.show` is called."""
+
+import framebuf
+
+
+class Overlay:
+    """A region of the display that is drawn over top of everything else.
+
+    Overlays are only redrawn when they are invalidated (using `invalidate`),
+    or when something else is drawn over their region.
+
+    If `cache` is True, the drawn overlay is saved,
+    and is copied back onto the display (rather than redrawn) when something else is drawn over its region.
+    This is faster, but it uses more memory, and the overlay must be fully opaque.
+    Opaque (cached) overlays are always drawn before transparent ones, so that they never cover them.
+    """
+
+    def __init__(self, x: int, y: int, width: int, height: int, callback: callable, *, cache: bool = False):
+        """Create a new Overlay.
+
+        Args:
+            x (int): The left edge of the overlay region.
+            y (int): The top edge of the overlay region.
+            width (int): The width of the overlay region.
+            height (int): The height of the overlay region.
+            callback (callable):
+                A function that draws the overlay.
+                It should accept the `Display` as a single positional argument,
+                and should not draw outside of the overlay region.
+        Kwargs:
+            cache (bool):
+                Whether or not to save the drawn overlay, so it can be copied back to the display later.
+                Only use this for opaque overlays (that fill their entire region).
+        """
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.callback = callback
+        self.cache = cache
+        # (this stays True even if there isn't enough memory for the cache)
+        self.opaque = cache
+        self.dirty = True
+        self._cache_fbuf = None
+
+
+    def invalidate(self):
+        """Flag that the overlay has changed, and needs to be redrawn.
+
+        This is safe to call from a Timer callback.
+        """
+        self.dirty = True
+
+
+    def _init_cache(self, display):
+        """Allocate the buffer for the cached overlay, or disable caching if there isn't enough memory."""
+        try:
+            buf = bytearray(display._bytes_per_row(self.width) * self.height)
+        except MemoryError:
+            print("WARNING: Not enough memory to cache overlay.")
+            self.cache = False
+            return
+        self._cache_fbuf = framebuf.FrameBuffer(
+            buf,
+            self.width,
+            self.height,
+            display.fbuf_format,
+            )
+
+
+    def update(self, display, *, redraw: bool = False):
+        """Draw (or restore) the overlay, if it is needed.
+
+        Args:
+            display (Display): The display to draw to.
+        Kwargs:
+            redraw (bool): Redraw the overlay, even if it hasn't been invalidated.
+        """
+        if redraw or self.dirty:
+            # clear the flag first, in case it is set again while we are drawing
+            self.dirty = False
+            self.callback(display)
+            if self.cache:
+                if self._cache_fbuf is None:
+                    self._init_cache(display)
+                if self._cache_fbuf is not None:
+                    self._cache_fbuf.blit(display.fbuf, -self.x, -self.y)
+
+        elif display.area_touched(self.x, self.y, self.x + self.width, self.y + self.height):
+            if self._cache_fbuf is None:
+                self.callback(display)
+            else:
+                display.fbuf.blit(self._cache_fbuf, self.x, self.y)
+                display._set_show_area(self.x, self.y, self.x + self.width, self.y + self.height)
@@ -9,11 +9,20 @@ Key notes on Palette:
 
   - Returns an RGB565 color when using normal framebuffer, or an index of the color if use_tiny_buf.
     (This makes it so that you can pass a `Palette[i]` to the Display class in either mode.)
+    `use_tiny_buf` is also set when the display uses an 8 bit (GS8) framebuffer, which uses indices too.
+
+  - Has 16 colors by default, but can be resized (the display uses 256 colors in GS8 mode).
 
   - Palette is a singleton, which is important so that different MH classes can modify and share it's data
     (without initializing the Display).
 """
 
+# levels of each channel in the standard 6x6x6 color cube
+_CUBE_LEVELS = const((0, 95, 135, 175, 215, 255))
+_CUBE_START = const(16)
+_GRAY_START = const(232)
+
+
 # Palette class
 class Palette:
     """Stores the user color palette and converts the values for lib.Display."""
@@ -42,6 +51,37 @@ class Palette:
         buf_ptr = ptr16(self.buf)
         return buf_ptr[key]
 
+    def resize(self, length: int):
+        """Change the number of colors in the palette.
+
+        Existing colors are kept, and new colors are filled from the standard 256 color (xterm) layout:
+        a 6x6x6 color cube starting at index 16 (`16 + 36*r + 6*g + b`),
+        followed by 24 shades of gray starting at index 232.
+        """
+        old_buf = self.buf
+        keep = min(len(old_buf), length * 2)
+        buf = bytearray(length * 2)
+        buf[:keep] = old_buf[:keep]
+        Palette.buf = buf
+        for idx in range(keep // 2, length):
+            self[idx] = self._standard_color(idx)
+
+
+    @staticmethod
+    def _standard_color(idx: int) -> int:
+        """Get the RGB565 color at the given index of the standard 256 color layout."""
+        if idx < _CUBE_START:
+            return 0
+        if idx < _GRAY_START:
+            idx -= _CUBE_START
+            red = _CUBE_LEVELS[idx // 36]
+            green = _CUBE_LEVELS[(idx // 6) % 6]
+            blue = _CUBE_LEVELS[idx % 6]
+        else:
+            red = green = blue = min(255, 8 + (idx - _GRAY_START) * 10)
+        return ((red & 0xf8) << 8) | ((green & 0xfc) << 3) | (blue >> 3)
+
+
     def __iter__(self):
         for i in range(len(self)):
             yield self[i]
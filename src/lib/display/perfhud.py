@@ -0,0 +1,182 @@
+"""An optional on-device performance overlay (toggled with the 'opt' + 'p' system command)."""
+
+import array
+import gc
+import time
+
+from .display import Display
+from lib.hydra.scheduler import FrameScheduler
+
+
+_MH_DISPLAY_HEIGHT = const(135)
+
+# Number of frames shown in the graph (one pixel column each)
+_GRAPH_LEN = const(120)
+_GRAPH_HEIGHT = const(24)
+# microseconds per graph pixel (2ms per pixel)
+_GRAPH_US_PER_PX = const(2000)
+
+_LINE_HEIGHT = const(10)
+_PADDING = const(2)
+
+_HUD_WIDTH = const(200)
+_HUD_HEIGHT = const(_GRAPH_HEIGHT + _LINE_HEIGHT * 3 + _PADDING * 2)
+_HUD_X = const(0)
+_HUD_Y = const(_MH_DISPLAY_HEIGHT - _HUD_HEIGHT)
+_GRAPH_Y = const(_MH_DISPLAY_HEIGHT - _PADDING)
+
+# the HUD is redrawn at most this often (unless it has been drawn over)
+_REDRAW_MS = const(250)
+
+# Frame time segments (stored as 4 values per frame, in units of 100us):
+_INPUT = const(0)
+_APP = const(1)
+_OVERLAY = const(2)
+_FLUSH = const(3)
+_NUM_SEGMENTS = const(4)
+
+# palette indices used for each segment (green, blue, complementary, red)
+_SEGMENT_COLORS = const((12, 13, 14, 11))
+_SEGMENT_LABELS = const(("i", "a", "o", "s"))
+
+
+
+class PerfHUD:
+    """Record where each frame's time goes, and draw it as an overlay.
+
+    While the HUD is enabled, `Display.perf` is set to the HUD,
+    and the timing hooks in `Display.show`, `UserInput.get_new_keys`, and `FrameScheduler` report to it.
+    When it is disabled, `Display.perf` is None, and each hook costs only a single attribute check.
+
+    Each frame is split into:
+    - input: time spent in `UserInput.get_new_keys`
+    - app: the rest of the frame (app logic and drawing)
+    - overlay: time spent drawing overlays (including the HUD itself)
+    - spi: time spent writing to the display (or waiting for the last frame, when using `async_show`)
+
+    Without a `FrameScheduler`, a frame is measured from one `show` to the next,
+    so time the app spends sleeping is counted as "app" time.
+    """
+
+    def __init__(self):
+        """Create the PerfHUD. (Use `PerfHUD.toggle` to enable it)."""
+        self._history = array.array('H', bytes(_GRAPH_LEN * _NUM_SEGMENTS * 2))
+        self._frame_count = 0
+        self._frame_start = time.ticks_us()
+        self.input_us = 0
+
+        # memory stats
+        self._last_alloc = gc.mem_alloc()
+        self._gc_count = 0
+        self._gc_window_start = time.ticks_ms()
+        self.gc_per_sec = 0
+        self.show_bytes = 0
+
+        self._last_draw = 0
+
+
+    @staticmethod
+    def toggle():
+        """Enable or disable the PerfHUD."""
+        if Display.perf is None:
+            hud = PerfHUD()
+            Display.perf = hud
+            Display.overlay_callbacks.append(hud.draw)
+        else:
+            Display.overlay_callbacks.remove(Display.perf.draw)
+            Display.perf = None
+            # erase the HUD (banded displays are fully redrawn on the next frame anyway)
+            display = Display.instance
+            if not display.band_lines:
+                display.fill_rect(_HUD_X, _HUD_Y, _HUD_WIDTH, _HUD_HEIGHT, display.palette[2])
+            # have the app redraw what was under the HUD
+            if FrameScheduler.active is not None:
+                FrameScheduler.active.invalidate()
+            # and let the other overlays restore themselves over the HUD area
+            Display.draw_overlays = True
+
+
+    def begin_frame(self):
+        """Mark the start of a new frame (called by the frame loop)."""
+        self._frame_start = time.ticks_us()
+
+
+    def show(self, display: Display):
+        """Draw overlays and write the frame to the display, timing each step. (Called by `Display.show`)."""
+        start = time.ticks_us()
+        display._draw_overlays()
+        overlays_done = time.ticks_us()
+        display._show_frame()
+        end = time.ticks_us()
+
+        total = time.ticks_diff(end, self._frame_start)
+        overlay_us = time.ticks_diff(overlays_done, start)
+        flush_us = time.ticks_diff(end, overlays_done)
+        app_us = max(0, total - self.input_us - overlay_us - flush_us)
+
+        idx = (self._frame_count % _GRAPH_LEN) * _NUM_SEGMENTS
+        history = self._history
+        history[idx + _INPUT] = min(self.input_us // 100, 0xffff)
+        history[idx + _APP] = min(app_us // 100, 0xffff)
+        history[idx + _OVERLAY] = min(overlay_us // 100, 0xffff)
+        history[idx + _FLUSH] = min(flush_us // 100, 0xffff)
+        self._frame_count += 1
+        self.input_us = 0
+        self._frame_start = end
+        self.show_bytes = display.show_bytes
+
+        # MicroPython doesn't count collections, but allocated memory only drops when one happens.
+        alloc = gc.mem_alloc()
+        if alloc < self._last_alloc:
+            self._gc_count += 1
+        self._last_alloc = alloc
+        now = time.ticks_ms()
+        if time.ticks_diff(now, self._gc_window_start) >= 1000:
+            self.gc_per_sec = self._gc_count
+            self._gc_count = 0
+            self._gc_window_start = now
+
+
+    def draw(self, display: Display):
+        """Draw the HUD. (Called from `Display.overlay_callbacks`)."""
+        now = time.ticks_ms()
+        # (in banded mode, the HUD must be drawn into every band)
+        if time.ticks_diff(now, self._last_draw) < _REDRAW_MS \
+        and not display.band_lines \
+        and not display.area_touched(_HUD_X, _HUD_Y, _HUD_X + _HUD_WIDTH, _HUD_Y + _HUD_HEIGHT):
+            return
+        self._last_draw = now
+
+        palette = display.palette
+        history = self._history
+        display.fill_rect(_HUD_X, _HUD_Y, _HUD_WIDTH, _HUD_HEIGHT, palette[0])
+
+        # latest frame, split into segments
+        latest = ((self._frame_count - 1) % _GRAPH_LEN) * _NUM_SEGMENTS
+        x = _HUD_X + _PADDING
+        y = _HUD_Y + _PADDING
+        for seg in range(_NUM_SEGMENTS):
+            text = f"{_SEGMENT_LABELS[seg]}{history[latest + seg] / 10:.1f} "
+            display.text(text, x, y, palette[_SEGMENT_COLORS[seg]])
+            x += len(text) * 8
+
+        y += _LINE_HEIGHT
+        display.text(f"mem {gc.mem_free() // 1024}k gc {self.gc_per_sec}/s", _HUD_X + _PADDING, y, palette[10])
+        y += _LINE_HEIGHT
+        display.text(f"dirty {self.show_bytes}B/frame", _HUD_X + _PADDING, y, palette[10])
+
+        # rolling graph (oldest frame on the left), segments stacked from the bottom
+        count = min(self._frame_count, _GRAPH_LEN)
+        x = _HUD_X + _PADDING + _GRAPH_LEN - count
+        frame = self._frame_count - count
+        while frame < self._frame_count:
+            idx = (frame % _GRAPH_LEN) * _NUM_SEGMENTS
+            y = _GRAPH_Y
+            for seg in range(_NUM_SEGMENTS):
+                height = history[idx + seg] * 100 // _GRAPH_US_PER_PX
+                height = min(height, y - (_GRAPH_Y - _GRAPH_HEIGHT))
+                if height > 0:
+                    y -= height
+                    display.vline(x, y, height, palette[_SEGMENT_COLORS[seg]])
+            x += 1
+            frame += 1
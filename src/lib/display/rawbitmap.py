@@ -1,41 +1,57 @@
 """Object class for loading/structuring a raw bitmap file for use with the Display driver."""
 import os
 
+from .assetcache import AssetCache
+from lib.hydra.utils import get_instance
 
-class RawBitmap:
-    """Open a raw bitmap file for use with the Display core."""
-
-    cached_path = None
-    cache = None
 
-    def __init__(self, file_path: str, width: int, height: int, palette: list[int, ...]):
-        """Construct the bitmap from given file."""
+class RawBitmap:
+    """Open a raw bitmap file for use with the Display core.
+
+    Loaded files are stored in the shared `AssetCache`,
+    so re-opening a recently used bitmap doesn't read it from storage again.
+    """
+
+    def __init__(
+            self,
+            file_path: str,
+            width: int,
+            height: int,
+            palette: list[int, ...],
+            *,
+            stream: bool = False):
+        """Construct the bitmap from given file.
+
+        If `stream` is True, the file is not loaded into memory,
+        and the bitmap can only be drawn with `stream_to`.
+        """
         self.WIDTH = width
         self.HEIGHT = height
         self.PALETTE = palette
+        self.file_path = file_path
 
         # This assumes that the bits per pixel is always the minimum possible:
         self.BPP = 1
         while len(palette) > (1 << self.BPP):
             self.BPP += 1
 
-        if RawBitmap.cached_path == file_path:
-            # Use the cached buffer rather than reloading
-            self.size = len(RawBitmap.cache)
-            self.BITMAP = RawBitmap.cache
-        else:
-            # Load and cache a new buffer
+        if stream:
             self.size = os.stat(file_path)[6]
-            with open(file_path, 'rb') as f:
-                buf = bytearray(self.size)
-                f.readinto(buf)
-                self.BITMAP = memoryview(buf)
-
-            RawBitmap.cached_path = file_path
-            RawBitmap.cache = self.BITMAP
-
-    @classmethod
-    def clean(cls):
-        """Clear the bitmap cache."""
-        cls.cached_path = None
-        cls.cache = None
+            self.BITMAP = None
+        else:
+            self.BITMAP = get_instance(AssetCache).load(file_path)
+            self.size = len(self.BITMAP)
+
+
+    def stream_to(self, display, x: int, y: int):
+        """Draw the bitmap by streaming it from its file straight to the display.
+
+        This uses very little memory, but bypasses the framebuffer. (See `Display.stream_image`)
+        """
+        display.stream_image(self.file_path, x, y, self.WIDTH, self.HEIGHT, palette=self.PALETTE)
+
+
+    @staticmethod
+    def clean():
+        """Clear the bitmap cache (the shared `AssetCache`)."""
+        get_instance(AssetCache).clear()
@@ -0,0 +1,160 @@
+"""Preprocessed sprite sheets, for drawing many sprites at once with `Display.draw_batch`."""
+
+import array
+
+
+class SpriteAtlas:
+    """A sprite sheet, unpacked into a layout that is fast to draw.
+
+    The atlas is created from a bitmap module
+    (like those made by 'tools/bitmaps/sprites_converter.py' or 'image_converter.py').
+    Each sprite is unpacked to 1 byte per pixel, and trimmed to the bounding box of its non-transparent pixels.
+    The sprites are stored one after another in `pixels`,
+    and the start of each sprite is stored in `offsets`.
+    `frames` stores 4 values for each sprite: x offset, y offset, width, height (of the trimmed sprite).
+    """
+
+    def __init__(self, bitmap, *, palette: list[int]|None = None, key: int = -1):
+        """Unpack the given bitmap module into a new SpriteAtlas.
+
+        Args:
+            bitmap (bitmap_module): The module containing the sprites.
+        Kwargs:
+            palette (list[int]|None): Colors to use instead of the bitmap's palette.
+            key (int): Pixels matching this color are transparent, and are trimmed from each sprite.
+        """
+        self.WIDTH = width = bitmap.WIDTH
+        self.HEIGHT = height = bitmap.HEIGHT
+        bpp = bitmap.BPP
+        sprite_px = width * height
+
+        if hasattr(bitmap, 'BITMAPS'):
+            self.count = count = bitmap.BITMAPS
+        else:
+            self.count = count = len(bitmap.BITMAP) * 8 // (sprite_px * bpp)
+
+        self.palette = palette = bitmap.PALETTE if palette is None else palette
+        self.key = key
+
+        # unpack all the sprites into one byte per pixel
+        unpacked = bytearray(sprite_px * count)
+        self._unpack(bitmap.BITMAP, unpacked, bpp, sprite_px * count, len(bitmap.BITMAP))
+
+        # mark the palette indices that are transparent
+        transparent = bytearray(256)
+        for idx, color in enumerate(palette):
+            if color == key:
+                transparent[idx] = 1
+
+        # trim each sprite to its visible bounding box
+        self.offsets = array.array('I', bytes(count * 4))
+        self.frames = array.array('H', bytes(count * 8))
+        bbox = array.array('H', bytes(8))
+        unpacked = memoryview(unpacked)
+        pixels = bytearray()
+        for idx in range(count):
+            start = idx * sprite_px
+            self._find_bbox(unpacked, start, width, height, transparent, bbox)
+            x_min, y_min, x_max, y_max = bbox
+
+            self.offsets[idx] = len(pixels)
+            if x_max <= x_min:
+                # sprite is fully transparent
+                continue
+            self.frames[idx * 4] = x_min
+            self.frames[idx * 4 + 1] = y_min
+            self.frames[idx * 4 + 2] = x_max - x_min
+            self.frames[idx * 4 + 3] = y_max - y_min
+
+            for row in range(y_min, y_max):
+                row_start = start + row * width
+                pixels.extend(unpacked[row_start + x_min : row_start + x_max])
+
+        self.pixels = pixels
+
+        self._fmt_palette = None
+        self._fmt_key = 0
+        self._fmt_swap = None
+
+
+    def set_palette(self, palette: list[int]):
+        """Set new colors for the atlas.
+
+        The new palette must not change which palette indices are transparent.
+        """
+        self.palette = palette
+        self._fmt_palette = None
+
+
+    def formatted_palette(self, display) -> tuple[bytearray, int]:
+        """Get the palette and key, formatted for the given display.
+
+        The result is cached, so this is only recalculated when the palette or display format changes.
+        """
+        swap = display._swap_colors
+        if self._fmt_palette is None or self._fmt_swap != swap:
+            fmt_palette = array.array('H', bytes(len(self.palette) * 2))
+            for idx, color in enumerate(self.palette):
+                fmt_palette[idx] = display._format_color(color)
+            self._fmt_palette = fmt_palette
+            self._fmt_key = display._format_color(self.key)
+            self._fmt_swap = swap
+        return self._fmt_palette, self._fmt_key
+
+
+    @staticmethod
+    @micropython.viper
+    def _unpack(source, dest, bpp:int, total_px:int, source_len:int):
+        """Unpack MSB-first packed pixels into one byte per pixel."""
+        src = ptr8(source)
+        dst = ptr8(dest)
+        bitmask = 0xff >> (8 - bpp)
+
+        bit_idx = 0
+        px_idx = 0
+        while px_idx < total_px:
+            byte_idx = bit_idx >> 3
+            # read 2 bytes, in case the pixel crosses a byte boundary
+            word = int(src[byte_idx]) << 8
+            if byte_idx + 1 < source_len:
+                word |= int(src[byte_idx + 1])
+            dst[px_idx] = (word >> (16 - bpp - (bit_idx & 7))) & bitmask
+            bit_idx += bpp
+            px_idx += 1
+
+
+    @staticmethod
+    @micropython.viper
+    def _find_bbox(pixels, start:int, width:int, height:int, transparent, bbox):
+        """Find the bounding box (x_min, y_min, x_max, y_max) of the visible pixels of one sprite."""
+        px = ptr8(pixels)
+        clear = ptr8(transparent)
+        out = ptr16(bbox)
+        x_min = width
+        y_min = height
+        x_max = 0
+        y_max = 0
+
+        y = 0
+        while y < height:
+            row = start + y * width
+            x = 0
+            while x < width:
+                if not clear[px[row + x]]:
+                    if x < x_min:
+                        x_min = x
+                    if x >= x_max:
+                        x_max = x + 1
+                    if y < y_min:
+                        y_min = y
+                    y_max = y + 1
+                x += 1
+            y += 1
+
+        if x_max == 0:
+            x_min = 0
+            y_min = 0
+        out[0] = x_min
+        out[1] = y_min
+        out[2] = x_max
+        out[3] = y_max
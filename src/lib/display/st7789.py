@@ -42,6 +42,7 @@ This driver supports:
 - RGB and BGR color orders
 """
 
+import array
 import struct
 from time import sleep_ms
 
@@ -104,6 +105,13 @@ _ENCODE_PIXEL = const(">H")
 _ENCODE_PIXEL_SWAPPED = const("<H")
 _ENCODE_POS = const(">HH")
 _ENCODE_POS_16 = const("<HH")
+_ENCODE_SCROLL_DEF = const(">HHH")
+
+# Number of rows in the ST7789 frame memory (used for vertical scrolling)
+_ST7789_GRAM_ROWS = const(320)
+
+# Row flag from DisplayCore, for rows that must be sent when `skip_unchanged_rows` is used
+_ROW_CHANGED = const(2)
 
 # must be at least 128 for 8 bit wide fonts
 # must be at least 256 for 16 bit wide fonts
@@ -184,6 +192,10 @@ _ST7789_INIT_CMDS = const((
 class ST7789(DisplayCore):
     """ST7789 driver class."""
 
+    # Hardware scrolling (VSCRDEF/VSCSAD) is opt-in, by setting this to True.
+    # It only works in portrait rotations, which MicroHydra devices don't use by default.
+    hw_scroll = False
+
     def __init__(
             self,
             spi,
@@ -195,6 +207,9 @@ class ST7789(DisplayCore):
             cs=None,
             rotation=0,
             color_order='BGR',
+            stripe_lines=8,
+            little_endian=False,
+            color_bits=16,
             **kwargs):
         """Initialize display.
 
@@ -213,23 +228,69 @@ class ST7789(DisplayCore):
             - 3-Inverted Landscape
 
             color_order (literal['RGB'|'BGR']):
+
+            stripe_lines (int):
+                When using `use_tiny_buf` or `use_gs8_buf`, the number of lines converted to RGB565 before each SPI write.
+                (Uses `stripe_lines * width * 2` bytes of RAM)
+
+            little_endian (bool):
+                If True, the panel is configured (using RAMCTRL) to accept little-endian RGB565 data.
+                This lets the framebuffer use the native byte order, so colors never need to be swapped.
+
+            color_bits (literal[16|12]):
+                The number of bits per pixel sent to the display. (See `set_color_bits`)
         """
         self.rotations = self._find_rotations(width, height)
 
+        if little_endian:
+            # the panel accepts our native byte order, so nothing needs to be swapped
+            kwargs['needs_swap'] = False
+
         super().__init__(width, height, rotation=rotation, **kwargs)
 
         self.xstart = 0
         self.ystart = 0
+        # hardware scrolling state (see `scroll_lines`)
+        self._madctl = 0
+        self._scroll_offset = 0
         self.spi = spi
         self.reset = reset
         self.dc = dc
         self.cs = cs
+        # nesting depth of `begin_batch` (CS is held low while this is nonzero)
+        self._batch_depth = 0
+        # the last window sent by `_set_window` (column start/end, row start/end), and a buffer for sending it
+        self._window = array.array('H', b'\xff' * 8)
+        self._pos_buf = bytearray(4)
         self._rotation = rotation % 4
         self.color_order = _RGB if color_order == "RGB" else _BGR
+
+        if self.use_tiny_buf:
+            # lookup table that converts one byte (two 4bit pixels) into two RGB565 pixels
+            self._tiny_lut = bytearray(1024)
+        elif self.use_gs8_buf:
+            # lookup table that converts one 8bit pixel into an RGB565 pixel
+            self._gs8_lut = bytearray(512)
+        # palette/swap that the lookup table was built with (None forces a rebuild)
+        self._lut_palette = None
+        self._lut_swap = None
+        self._lut_bits = None
+
+        # output buffer for converted lines (sized for any rotation)
+        # Only needed for tiny_buf, gs8_buf, or 12 bit color, so it's allocated when it's needed.
+        self._stripe_lines = stripe_lines
+        self._stripe_buf = None
+        if self.use_tiny_buf or self.use_gs8_buf:
+            self._alloc_stripe_buf()
+
+        self.little_endian = little_endian
         self.hard_reset()
         # yes, twice, once is not always enough
         self.init(_ST7789_INIT_CMDS)
         self.init(_ST7789_INIT_CMDS)
+        self._set_endianness()
+        self.color_bits = 16
+        self.set_color_bits(color_bits)
         self.rotation(self._rotation)
         self.fill(0x0)
         self.show()
@@ -239,6 +300,7 @@ class ST7789(DisplayCore):
         # mh_if not frozen:
         # when not frozen, the utf8 font is read as needed from a binary.
         self.utf8_font = open("/font/utf8_8x8.bin", "rb", buffering = 0)  # noqa: SIM115
+        self._load_utf8_index()
         # mh_end_if
 
 
@@ -253,99 +315,480 @@ class ST7789(DisplayCore):
 
     def init(self, commands: tuple):
         """Initialize display."""
+        self._invalidate_window()
         for command, data, delay in commands:
             self._write(command, data)
             sleep_ms(delay)
 
 
+    def _set_endianness(self):
+        """Set the byte order the panel expects for RGB565 data (using RAMCTRL)."""
+        # The second RAMCTRL byte defaults to 0xf0, bit 3 (ENDIAN) selects little-endian.
+        self._write(_ST7789_RAMCTL, b'\x00\xf8' if self.little_endian else b'\x00\xf0')
+
+
+    def _alloc_stripe_buf(self):
+        """Allocate the buffer used for converting several lines of pixels at once."""
+        if self._stripe_buf is None:
+            self._stripe_buf = bytearray(max(self.width, self.height) * 2 * self._stripe_lines)
+
+
+    def set_color_bits(self, bits: int):
+        """Set the number of bits per pixel sent to the display (using COLMOD).
+
+        16 bit mode sends the framebuffer data as-is (RGB565).
+        12 bit mode (RGB444) packs two pixels into three bytes as they are sent,
+        which cuts the SPI traffic by 25%, at the cost of some color precision.
+        """
+        if bits not in {12, 16}:
+            msg = f"{bits} bit color is not supported (Use 12 or 16)."
+            raise ValueError(msg)
+        if bits == 12:
+            self._alloc_stripe_buf()
+        self._reset_hw_scroll()
+        self.color_bits = bits
+        self._write(
+            _ST7789_COLMOD,
+            bytes([_COLOR_MODE_65K | (_COLOR_MODE_12BIT if bits == 12 else _COLOR_MODE_16BIT)]),
+            )
+
+
     def _write(self, command=None, data=None):
         """SPI write to the device: commands and data."""
-        # mh_if shared_sdcard_spi:
-        # # TDeck shares SPI with SDCard
-        # self.spi.init(baudrate=_MH_DISPLAY_BAUDRATE)
-        # mh_end_if
-        if self.cs:
-            self.cs.off()
+        self._select()
         if command is not None:
             self.dc.off()
             self.spi.write(command)
         if data is not None:
             self.dc.on()
             self.spi.write(data)
-        if self.cs:
+        self._deselect()
+
+
+    def _select(self):
+        """Start an SPI transaction by lowering CS (unless a batch has already started one)."""
+        if self._batch_depth == 0:
+            # mh_if shared_sdcard_spi:
+            # # TDeck shares SPI with SDCard
+            # self.spi.init(baudrate=_MH_DISPLAY_BAUDRATE)
+            # mh_end_if
+            if self.cs:
+                self.cs.off()
+
+
+    def _deselect(self):
+        """End an SPI transaction by raising CS (unless it is part of a batch)."""
+        if self._batch_depth == 0 and self.cs:
             self.cs.on()
 
 
+    def begin_batch(self):
+        """Start a group of display writes that share a single SPI transaction.
+
+        CS is held low (and a shared SPI bus is only re-initialized once) until the matching `end_batch`.
+        Batches can be nested. Other devices on a shared SPI bus must not be used during a batch.
+        """
+        self._select()
+        self._batch_depth += 1
+
+
+    def end_batch(self):
+        """End a group of display writes started by `begin_batch`."""
+        self._batch_depth -= 1
+        self._deselect()
+
+
+    def _update_lut(self):
+        """Rebuild the tiny_buf/gs8_buf lookup table, if the palette (or byte order) has changed."""
+        if self._lut_swap is not self.needs_swap \
+        or self._lut_bits != self.color_bits \
+        or self._lut_palette != self.palette.buf:
+            self._lut_palette = bytearray(self.palette.buf)
+            self._lut_swap = self.needs_swap
+            self._lut_bits = self.color_bits
+            if self.use_tiny_buf:
+                self._build_tiny_lut()
+            else:
+                self._build_gs8_lut()
+
+
     @micropython.viper
-    def _write_tiny_buf(self, y_min: int, y_max: int):
+    def _build_tiny_lut(self):
+        """Fill the lookup table used to convert a byte of tiny_buf data into two RGB565 pixels.
+
+        In 16 bit mode, each entry holds the color of the high nibble (the first pixel) in its lower 16 bits,
+        and the color of the low nibble (the second pixel) in its upper 16 bits.
+
+        In 12 bit mode, each entry holds both RGB444 colors in its lower 24 bits,
+        in the order they are sent to the display (first pixel in the upper 12 bits).
+        """
+        lut = ptr32(self._tiny_lut)
+        palette = ptr16(self._lut_palette)
+        swap = bool(self.needs_swap)
+        use_12_bit = int(self.color_bits) == 12
+
+        idx = 0
+        while idx < 256:
+            first = int(palette[idx >> 4])
+            second = int(palette[idx & 0xf])
+            if use_12_bit:
+                first = ((first >> 12) << 8) | ((first >> 3) & 0xf0) | ((first >> 1) & 0xf)
+                second = ((second >> 12) << 8) | ((second >> 3) & 0xf0) | ((second >> 1) & 0xf)
+                lut[idx] = (first << 12) | second
+            else:
+                if swap:
+                    first = ((first & 255) << 8) | (first >> 8)
+                    second = ((second & 255) << 8) | (second >> 8)
+                lut[idx] = first | (second << 16)
+            idx += 1
+
+
+    @micropython.viper
+    def _build_gs8_lut(self):
+        """Fill the lookup table used to convert a gs8_buf pixel into an RGB565 pixel (or RGB444 in 12 bit mode)."""
+        lut = ptr16(self._gs8_lut)
+        palette = ptr16(self._lut_palette)
+        num_colors = int(len(self._lut_palette)) >> 1
+        swap = bool(self.needs_swap)
+        use_12_bit = int(self.color_bits) == 12
+
+        idx = 0
+        while idx < 256:
+            color = int(palette[idx]) if idx < num_colors else 0
+            if use_12_bit:
+                color = ((color >> 12) << 8) | ((color >> 3) & 0xf0) | ((color >> 1) & 0xf)
+            elif swap:
+                color = ((color & 255) << 8) | (color >> 8)
+            lut[idx] = color
+            idx += 1
+
+
+    @micropython.viper
+    def _write_tiny_buf(self, fbuf, x_min: int, y_min: int, x_max: int, y_max: int):
         """Convert tiny_buf data to RGB565 and write to SPI.
 
-        This Viper method iterates over each line from y_min to y_max,
-        converts the 4bit data to 16bit RGB565 format,
-        and sends the data over SPI.
+        This Viper method converts the 4bit data from x_min to x_max into 16bit RGB565 format,
+        one byte (two pixels) at a time, using a lookup table.
+        Several lines are converted into the stripe buffer before each SPI write.
+
+        x_min must be even.
         """
-        # mh_if shared_sdcard_spi:
-        # # TDeck shares SPI with SDCard
-        # self.spi.init(baudrate=_MH_DISPLAY_BAUDRATE)
-        # mh_end_if
-        if self.cs:
-            self.cs.off()
+        self._update_lut()
+
+        self._select()
         self.dc.on()
 
         width = int(self.width)
-        start_y = int(y_min)
-        end_y = int(y_max)
-
-        # swap colors in palette if needed
-        if self.needs_swap:
-            palette_buf = bytearray(32)
-            target_palette_ptr = ptr16(palette_buf)
-            source_palette_ptr = ptr16(self.palette.buf)
-            for i in range(16):
-                target_palette_ptr[i] = ((source_palette_ptr[i] & 255) << 8) | (source_palette_ptr[i] >> 8)
-        else:
-            target_palette_ptr = ptr16(self.palette.buf)
+        lut = ptr32(self._tiny_lut)
+        source = ptr8(fbuf)
+        source_width = width // 2 if (width % 8 == 0) else ((width + 1) // 2)
+
+        stripe_buf = self._stripe_buf
+        stripe_view = memoryview(stripe_buf)
+        stripe_lines = int(self._stripe_lines)
+        output32 = ptr32(stripe_buf)
+        output16 = ptr16(stripe_buf)
+
+        out_width = x_max - x_min
+        byte_start = x_min >> 1
+        num_pairs = out_width >> 1
+        # an odd output width can only happen on the last column of an odd-width display.
+        # In that case rows are not word-aligned, so 16 bit writes must be used instead.
+        odd_width = out_width & 1
+
+        y = y_min
+        while y < y_max:
+            lines = y_max - y
+            if lines > stripe_lines:
+                lines = stripe_lines
+
+            out_idx = 0  # (in pixels)
+            line = 0
+            while line < lines:
+                source_idx = source_width * (y + line) + byte_start
+                source_end = source_idx + num_pairs
+
+                if odd_width:
+                    while source_idx < source_end:
+                        pair = lut[source[source_idx]]
+                        output16[out_idx] = pair
+                        output16[out_idx + 1] = pair >> 16
+                        out_idx += 2
+                        source_idx += 1
+                    # last pixel comes from the high nibble of the next byte
+                    output16[out_idx] = lut[source[source_idx]]
+                    out_idx += 1
+                else:
+                    word_idx = out_idx >> 1
+                    while source_idx < source_end:
+                        output32[word_idx] = lut[source[source_idx]]
+                        word_idx += 1
+                        source_idx += 1
+                    out_idx += out_width
+                line += 1
+
+            # Write stripe to SPI
+            self.spi.write(stripe_view[:out_idx * 2])
+            y += lines
+
+        self._deselect()
+
+
+    @micropython.viper
+    def _write_tiny_buf_12(self, fbuf, x_min: int, y_min: int, x_max: int, y_max: int):
+        """Convert tiny_buf data to RGB444, and write to SPI (two pixels per three bytes).
+
+        Each source byte is converted into three output bytes using the lookup table.
+        x_min must be even.
+        """
+        self._update_lut()
 
+        self._select()
+        self.dc.on()
 
-        # prepare variables for line conversion loop:
-        source_ptr = ptr8(self.fbuf)
+        width = int(self.width)
+        lut = ptr32(self._tiny_lut)
+        source = ptr8(fbuf)
         source_width = width // 2 if (width % 8 == 0) else ((width + 1) // 2)
-        output_buf = bytearray(width * 2)
-        output = ptr16(output_buf)
 
-        # Iterate (vertically) over each horizontal line in given range:
-        while start_y < end_y:
-            source_start_idx = source_width * start_y
-            output_idx = 0
-            # Iterate over horizontal pixels:
-            while output_idx < width:
-                # Calculate source pixel location, and sample it.
-                source_idx = source_start_idx + (output_idx // 2)
-                sample = source_ptr[source_idx] >> 4 if (output_idx % 2 == 0) else source_ptr[source_idx] & 0xf
+        stripe_view = memoryview(self._stripe_buf)
+        stripe_lines = int(self._stripe_lines)
+        output = ptr8(self._stripe_buf)
+
+        out_width = x_max - x_min
+        byte_start = x_min >> 1
+        num_pairs = out_width >> 1
+        # An odd output width can only happen on the last column of an odd-width display.
+        # In that case, pixels are packed one at a time, carrying an unpaired pixel between rows.
+        odd_width = out_width & 1
+        pending = 0
+        has_pending = False
+
+        y = y_min
+        while y < y_max:
+            lines = y_max - y
+            if lines > stripe_lines:
+                lines = stripe_lines
+
+            out_idx = 0
+            line = 0
+            while line < lines:
+                source_idx = source_width * (y + line) + byte_start
+
+                if odd_width:
+                    px = 0
+                    while px < out_width:
+                        sample = source[source_idx + (px >> 1)]
+                        sample = sample >> 4 if (px & 1) == 0 else sample & 0xf
+                        # the lut entry for a byte with two identical pixels holds that color twice
+                        color = int(lut[sample * 17]) & 0xfff
+                        if has_pending:
+                            output[out_idx] = pending >> 4
+                            output[out_idx + 1] = ((pending & 0xf) << 4) | (color >> 8)
+                            output[out_idx + 2] = color
+                            out_idx += 3
+                            has_pending = False
+                        else:
+                            pending = color
+                            has_pending = True
+                        px += 1
+                else:
+                    source_end = source_idx + num_pairs
+                    while source_idx < source_end:
+                        pair = lut[source[source_idx]]
+                        output[out_idx] = pair >> 16
+                        output[out_idx + 1] = pair >> 8
+                        output[out_idx + 2] = pair
+                        out_idx += 3
+                        source_idx += 1
+                line += 1
+
+            # (`_write_area` ensures the total pixel count is even, so nothing is left pending at the end)
+            self.spi.write(stripe_view[:out_idx])
+            y += lines
+
+        self._deselect()
 
-                output[output_idx] = target_palette_ptr[sample]
-                output_idx += 1
 
-            # Write buffer to SPI
-            self.spi.write(output_buf)
+    @micropython.viper
+    def _write_gs8_buf(self, fbuf, x_min: int, y_min: int, x_max: int, y_max: int):
+        """Convert gs8_buf data to RGB565 and write to SPI.
+
+        Each 8bit pixel is converted using a lookup table,
+        and several lines are converted into the stripe buffer before each SPI write.
+        """
+        self._update_lut()
 
-            start_y += 1
+        self._select()
+        self.dc.on()
 
-        if self.cs:
-            self.cs.on()
+        width = int(self.width)
+        lut = ptr16(self._gs8_lut)
+        source = ptr8(fbuf)
+
+        stripe_view = memoryview(self._stripe_buf)
+        stripe_lines = int(self._stripe_lines)
+        output = ptr16(self._stripe_buf)
+        out_width = x_max - x_min
+
+        y = y_min
+        while y < y_max:
+            lines = y_max - y
+            if lines > stripe_lines:
+                lines = stripe_lines
+
+            out_idx = 0
+            line = 0
+            while line < lines:
+                source_idx = (y + line) * width + x_min
+                source_end = source_idx + out_width
+                while source_idx < source_end:
+                    output[out_idx] = lut[source[source_idx]]
+                    out_idx += 1
+                    source_idx += 1
+                line += 1
+
+            # Write stripe to SPI
+            self.spi.write(stripe_view[:out_idx * 2])
+            y += lines
+
+        self._deselect()
+
+
+    @micropython.viper
+    def _write_gs8_buf_12(self, fbuf, x_min: int, y_min: int, x_max: int, y_max: int):
+        """Convert gs8_buf data to RGB444, and write to SPI (two pixels per three bytes)."""
+        self._update_lut()
+
+        self._select()
+        self.dc.on()
+
+        width = int(self.width)
+        lut = ptr16(self._gs8_lut)
+        source = ptr8(fbuf)
+
+        stripe_view = memoryview(self._stripe_buf)
+        stripe_lines = int(self._stripe_lines)
+        output = ptr8(self._stripe_buf)
+
+        # pixels are packed in pairs, so an unpaired pixel is carried over to the next row.
+        pending = 0
+        has_pending = False
+
+        y = y_min
+        while y < y_max:
+            lines = y_max - y
+            if lines > stripe_lines:
+                lines = stripe_lines
+
+            out_idx = 0
+            line = 0
+            while line < lines:
+                source_idx = (y + line) * width + x_min
+                source_end = source_idx + (x_max - x_min)
+                while source_idx < source_end:
+                    color = int(lut[source[source_idx]])
+                    if has_pending:
+                        output[out_idx] = pending >> 4
+                        output[out_idx + 1] = ((pending & 0xf) << 4) | (color >> 8)
+                        output[out_idx + 2] = color
+                        out_idx += 3
+                        has_pending = False
+                    else:
+                        pending = color
+                        has_pending = True
+                    source_idx += 1
+                line += 1
+
+            # (`_write_area` ensures the total pixel count is even, so nothing is left pending at the end)
+            self.spi.write(stripe_view[:out_idx])
+            y += lines
+
+        self._deselect()
+
+
+    @micropython.viper
+    def _write_normal_buf_12(self, fbuf, x_min: int, y_min: int, x_max: int, y_max: int):
+        """Convert RGB565 framebuf data to RGB444, and write to SPI (two pixels per three bytes)."""
+        self._select()
+        self.dc.on()
+
+        width = int(self.width)
+        swap = bool(self._swap_colors)
+        source = ptr16(fbuf)
+
+        stripe_view = memoryview(self._stripe_buf)
+        stripe_lines = int(self._stripe_lines)
+        output = ptr8(self._stripe_buf)
+
+        # pixels are packed in pairs, so an unpaired pixel is carried over to the next row.
+        pending = 0
+        has_pending = False
+
+        y = y_min
+        while y < y_max:
+            lines = y_max - y
+            if lines > stripe_lines:
+                lines = stripe_lines
+
+            out_idx = 0
+            line = 0
+            while line < lines:
+                source_idx = (y + line) * width + x_min
+                source_end = source_idx + (x_max - x_min)
+                while source_idx < source_end:
+                    color = int(source[source_idx])
+                    if swap:
+                        color = ((color & 255) << 8) | (color >> 8)
+                    # RGB565 -> RGB444
+                    color = ((color >> 12) << 8) | ((color >> 3) & 0xf0) | ((color >> 1) & 0xf)
+
+                    if has_pending:
+                        output[out_idx] = pending >> 4
+                        output[out_idx + 1] = ((pending & 0xf) << 4) | (color >> 8)
+                        output[out_idx + 2] = color
+                        out_idx += 3
+                        has_pending = False
+                    else:
+                        pending = color
+                        has_pending = True
+                    source_idx += 1
+                line += 1
+
+            # (`_write_area` ensures the total pixel count is even, so nothing is left pending at the end)
+            self.spi.write(stripe_view[:out_idx])
+            y += lines
+
+        self._deselect()
+
+
+    def _write_normal_buf(self, fbuf, x_min: int, y_min: int, x_max: int, y_max: int):
+        """Write normal framebuf data, respecting the given show area."""
+        width = self.width
+        fbuf_view = memoryview(fbuf)
+
+        if x_min == 0 and x_max == width:
+            # full width rows are contiguous, and can be written in one go.
+            self._write(None, fbuf_view[y_min * width * 2 : y_max * width * 2])
+            return
 
+        # partial rows must be written one at a time
+        self._select()
+        self.dc.on()
 
-    def _write_normal_buf(self, y_min: int, y_max: int):
-        """Write normal framebuf data, respecting show_y_min/max values."""
-        source_start_idx = y_min * self.width * 2
-        source_end_idx = y_max * self.width * 2
+        row_start = (y_min * width + x_min) * 2
+        row_len = (x_max - x_min) * 2
+        row_step = width * 2
+        for _ in range(y_max - y_min):
+            self.spi.write(fbuf_view[row_start : row_start + row_len])
+            row_start += row_step
 
-        if source_start_idx < source_end_idx:
-            self._write(None, memoryview(self.fbuf)[source_start_idx:source_end_idx])
+        self._deselect()
 
 
     def hard_reset(self):
         """Hard reset display."""
+        self._invalidate_window()
         if self.cs:
             self.cs.off()
         if self.reset:
@@ -363,6 +806,7 @@ class ST7789(DisplayCore):
 
     def soft_reset(self):
         """Soft reset display."""
+        self._invalidate_window()
         self._write(_ST7789_SWRESET)
         sleep_ms(150)
 
@@ -425,19 +869,90 @@ class ST7789(DisplayCore):
             self.xstart,
             self.ystart,
         ) = self.rotations[rotation]
+        # the panel's addressing (and offsets) change with rotation
+        self._invalidate_window()
+        if not self.band_lines:
+            self._fbuf_height = self.height
 
         if self.color_order == _BGR:
             madctl |= _ST7789_MADCTL_BGR
         else:
             madctl &= ~_ST7789_MADCTL_BGR
 
+        self._reset_hw_scroll()
+        self._madctl = madctl
         self._write(_ST7789_MADCTL, bytes([madctl]))
 
 
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ Hardware scrolling: ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    def _can_hw_scroll(self) -> bool:
+        """Check if the panel can scroll the display vertically.
+
+        The ST7789 only scrolls along its frame memory rows,
+        which are only the display's rows in non-rotated (portrait) orientation.
+        12 bit color also needs an even width, because rows are written in pairs of pixels.
+        Hardware scrolling must also be enabled with `hw_scroll`.
+        """
+        return (
+            self.hw_scroll
+            and self._madctl & (_ST7789_MADCTL_MV | _ST7789_MADCTL_MY) == 0
+            and (self.color_bits == 16 or self.width % 2 == 0)
+            )
+
+
+    def set_scroll_area(self, top: int = 0, bottom: int = 0):
+        """Set the area of the display that is moved by `scroll_lines`.
+
+        Args:
+            top (int): The number of fixed (unscrolled) rows at the top of the display.
+            bottom (int): The number of fixed (unscrolled) rows at the bottom of the display.
+        """
+        self._reset_hw_scroll()
+        super().set_scroll_area(top, bottom)
+
+
+    def _flush_before_scroll(self):
+        """Send any pending changes to the display (before it is scrolled)."""
+        regions, count = self.reset_show_regions()
+        if count:
+            self._flush(self.fbuf, regions, count)
+
+
+    def _hw_scroll(self, lines: int):
+        """Scroll the panel using VSCRDEF/VSCSAD."""
+        top = self._scroll_top
+        height = self.height - self._scroll_fixed_bottom - top
+        self._scroll_offset = (self._scroll_offset + lines) % height
+        # scroll area is set in panel memory rows
+        top += self.ystart
+        self._write_scroll(top, height, top + self._scroll_offset)
+
+
+    def _write_scroll(self, top: int, height: int, start: int):
+        """Send the scroll area definition (VSCRDEF) and scroll start address (VSCSAD) to the panel."""
+        self._write(
+            _ST7789_VSCRDEF,
+            struct.pack(_ENCODE_SCROLL_DEF, top, height, _ST7789_GRAM_ROWS - top - height),
+            )
+        self._write(_ST7789_VSCSAD, struct.pack(_ENCODE_PIXEL, start))
+
+
+    def _reset_hw_scroll(self):
+        """Undo any hardware scrolling, and redraw the display to match."""
+        if self._scroll_offset:
+            self._scroll_offset = 0
+            self._write_scroll(0, _ST7789_GRAM_ROWS, 0)
+            # the panel's rows are no longer where the framebuffer expects them
+            self._set_show_area(0, 0, self.width, self.height)
+
+
     def _set_window(self, x0, y0, x1, y1):
         """
         Set window to column and row address.
 
+        The last window is remembered, and the column/row addresses are only sent when they change.
+        All the commands are sent in a single SPI transaction.
+
         Args:
             x0 (int): column start address
             y0 (int): row start address
@@ -445,39 +960,409 @@ class ST7789(DisplayCore):
             y1 (int): row end address
         """
         if x0 <= x1 <= self.width and y0 <= y1 <= self.height:
-            self._write(
-                _ST7789_CASET,
-                struct.pack(_ENCODE_POS, x0 + self.xstart, x1 + self.xstart),
-            )
-            self._write(
-                _ST7789_RASET,
-                struct.pack(_ENCODE_POS, y0 + self.ystart, y1 + self.ystart),
-            )
-            self._write(_ST7789_RAMWR)
+            window = self._window
+            x0 += self.xstart
+            x1 += self.xstart
+            y0 += self.ystart
+            y1 += self.ystart
+
+            self._select()
+            if window[0] != x0 or window[1] != x1:
+                window[0] = x0
+                window[1] = x1
+                self._write_pos(_ST7789_CASET, x0, x1)
+            if window[2] != y0 or window[3] != y1:
+                window[2] = y0
+                window[3] = y1
+                self._write_pos(_ST7789_RASET, y0, y1)
+            self.dc.off()
+            self.spi.write(_ST7789_RAMWR)
+            self._deselect()
 
 
-    def show(self):
-        """Write the current framebuf to the display."""
-        # mh_if shared_sdcard_spi:
-        # # TDeck shares SPI with SDCard
-        # self.spi.init(baudrate=_MH_DISPLAY_BAUDRATE)
-        # mh_end_if
+    def _write_pos(self, command: bytes, start: int, end: int):
+        """Send a CASET/RASET command, with its start and end address. (CS must already be low)."""
+        struct.pack_into(_ENCODE_POS, self._pos_buf, 0, start, end)
+        self.dc.off()
+        self.spi.write(command)
+        self.dc.on()
+        self.spi.write(self._pos_buf)
 
-        # Reset and clamp min/max vals
-        y_min, y_max = self.reset_show_y()
 
-        if y_min >= y_max:
-            # nothing to show
-            return
+    def _invalidate_window(self):
+        """Forget the last window, so that the next window is always sent.
 
+        (Used when the panel may have lost, or changed the meaning of, its window)
+        """
+        window = self._window
+        window[0] = window[1] = window[2] = window[3] = 0xffff
+
+
+    def _write_area(self, fbuf, x_min: int, y_min: int, x_max: int, y_max: int) -> int:
+        """Set the display window, and write the given area of the framebuffer to it.
+
+        Returns the number of pixel bytes written.
+        """
+        if self.use_tiny_buf:
+            # tiny_buf is converted two pixels (one byte) at a time,
+            # so round the area out to whole bytes.
+            x_min &= ~1
+            if x_max & 1 and x_max < self.width:
+                x_max += 1
+
+        if self.color_bits == 12 and ((x_max - x_min) * (y_max - y_min)) & 1:
+            # 12 bit color is sent in pairs of pixels, so the area must have an even number of pixels.
+            # (x_min is left alone, because tiny_buf needs it to be even)
+            if x_max < self.width:
+                x_max += 1
+            elif y_max < self.height:
+                y_max += 1
+            elif y_min > 0:
+                y_min -= 1
+            else:
+                # the area spans the full height, so widen it to the left instead
+                # (by two pixels for tiny_buf, to keep x_min even)
+                step = 2 if self.use_tiny_buf else 1
+                if x_min >= step:
+                    x_min -= step
+
+        if self._scroll_offset:
+            return self._write_scrolled_area(fbuf, x_min, y_min, x_max, y_max)
+        return self._write_rows(fbuf, x_min, y_min, x_max, y_max, y_min)
+
+
+    def _write_scrolled_area(self, fbuf, x_min: int, y_min: int, x_max: int, y_max: int) -> int:
+        """Write an area while the panel is scrolled, moving the scrolled rows to where the panel shows them.
+
+        Rows in the scroll area are stored `_scroll_offset` rows further down in the panel's memory (wrapping around),
+        so the area is split into pieces that are each contiguous in the panel's memory.
+        """
+        if self.color_bits == 12 and (x_max - x_min) & 1:
+            # each piece must have an even number of pixels, so make the rows even.
+            # (only possible with an even width, which `_can_hw_scroll` requires)
+            if x_max < self.width:
+                x_max += 1
+            else:
+                x_min -= 1
+
+        top = self._scroll_top
+        bottom = self.height - self._scroll_fixed_bottom
+        # the first row (in framebuffer coordinates) that wraps back to the top of the scroll area
+        wrap = bottom - self._scroll_offset
+
+        written = 0
+        y = y_min
+        while y < y_max:
+            if y < top:
+                end = min(y_max, top)
+                panel_y = y
+            elif y >= bottom:
+                end = y_max
+                panel_y = y
+            elif y < wrap:
+                end = min(y_max, wrap)
+                panel_y = y + self._scroll_offset
+            else:
+                end = min(y_max, bottom)
+                panel_y = y - wrap + top
+            written += self._write_rows(fbuf, x_min, y, x_max, end, panel_y)
+            y = end
+        return written
+
+
+    def _write_rows(self, fbuf, x_min: int, y_min: int, x_max: int, y_max: int, panel_y: int) -> int:
+        """Write an area of the framebuffer to the display, starting at the given display row.
+
+        Returns the number of pixel bytes written.
+        """
         self._set_window(
-            0,
-            y_min,
-            self.width - 1,
-            y_max - 1,
+            x_min,
+            panel_y,
+            x_max - 1,
+            panel_y + y_max - y_min - 1,
             )
 
+        if self.color_bits == 12:
+            if self.use_tiny_buf:
+                self._write_tiny_buf_12(fbuf, x_min, y_min, x_max, y_max)
+            elif self.use_gs8_buf:
+                self._write_gs8_buf_12(fbuf, x_min, y_min, x_max, y_max)
+            else:
+                self._write_normal_buf_12(fbuf, x_min, y_min, x_max, y_max)
+            # two pixels per three bytes
+            return (x_max - x_min) * (y_max - y_min) * 3 // 2
+
         if self.use_tiny_buf:
-            self._write_tiny_buf(y_min, y_max)
+            self._write_tiny_buf(fbuf, x_min, y_min, x_max, y_max)
+        elif self.use_gs8_buf:
+            self._write_gs8_buf(fbuf, x_min, y_min, x_max, y_max)
+        else:
+            self._write_normal_buf(fbuf, x_min, y_min, x_max, y_max)
+
+        return (x_max - x_min) * (y_max - y_min) * 2
+
+
+    def _flush(self, fbuf, regions, count: int):
+        """Write the given regions of the given framebuffer to the display.
+
+        Args:
+            fbuf (FrameBuffer): The framebuffer to read from
+            regions (array): Region array, as returned by `reset_show_regions`
+            count (int): The number of regions in the array
+        """
+        # every region is written in a single SPI transaction
+        self.begin_batch()
+        try:
+            self._flush_regions(fbuf, regions, count)
+        finally:
+            self.end_batch()
+
+
+    def _flush_regions(self, fbuf, regions, count: int):
+        """Write the given regions of the framebuffer to the display. (See `_flush`)."""
+        skip_unchanged_rows = self.skip_unchanged_rows
+        if skip_unchanged_rows:
+            # check every row first, so that rows shared by several regions are only hashed once
+            idx = 0
+            while idx < count:
+                self._diff_rows(fbuf, regions[idx * 4 + 1], regions[idx * 4 + 3])
+                idx += 1
+            row_flags = self._row_flags
+            rows_sent = 0
+            rows_skipped = 0
+
+        show_bytes = 0
+        idx = 0
+        while idx < count:
+            r = idx * 4
+            x_min = regions[r]
+            y_min = regions[r + 1]
+            x_max = regions[r + 2]
+            y_max = regions[r + 3]
+
+            if skip_unchanged_rows:
+                # write each run of changed rows as a separate area
+                y = y_min
+                while y < y_max:
+                    if row_flags[y] != _ROW_CHANGED:
+                        rows_skipped += 1
+                        y += 1
+                        continue
+                    run_start = y
+                    while y < y_max and row_flags[y] == _ROW_CHANGED:
+                        y += 1
+                    show_bytes += self._write_area(fbuf, x_min, run_start, x_max, y)
+                    rows_sent += y - run_start
+            else:
+                show_bytes += self._write_area(fbuf, x_min, y_min, x_max, y_max)
+            idx += 1
+
+        if skip_unchanged_rows:
+            self._clear_row_flags()
+            self.rows_sent += rows_sent
+            self.rows_skipped += rows_skipped
+
+        self.show_regions = count
+        self.show_bytes = show_bytes
+
+
+    def show(self):
+        """Write the current framebuf to the display."""
+        if self.band_lines:
+            self._show_bands()
+            return
+
+        # Get (and reset) the regions that need to be written
+        regions, count = self.reset_show_regions()
+        self._flush(self.fbuf, regions, count)
+
+
+    def _show_bands(self):
+        """Draw the display one band at a time, writing each band to the display as soon as it is drawn.
+
+        Every band is written in full, so the drawn regions are ignored.
+        """
+        height = self.height
+        show_bytes = 0
+        band_y = 0
+        while band_y < height:
+            lines = min(self.band_lines, height - band_y)
+            self._band_y = band_y
+            self._draw_band()
+            show_bytes += self._write_rows(self.fbuf, 0, 0, self.width, lines, band_y)
+            band_y += lines
+        self._band_y = 0
+        self.reset_show_regions()
+
+        self.show_regions = 0
+        self.show_bytes = show_bytes
+
+
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ Streaming images: ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    def stream_image(
+            self,
+            file_path: str,
+            x: int,
+            y: int,
+            width: int,
+            height: int,
+            *,
+            palette: list[int]|None = None,
+            stripe_lines: int|None = None):
+        """Draw an image file straight to the display, without loading it into memory.
+
+        The image is read a few rows (a stripe) at a time, converted to RGB565, and written directly to the display.
+        This bypasses the framebuffer, so it can be used for images that are much too large to fit in RAM.
+        The framebuffer is not changed, so anything that is later shown over the same area will replace the image.
+
+        Args:
+            file_path (str): The image file.
+            x (int): The column to draw the left edge of the image at.
+            y (int): The row to draw the top edge of the image at.
+            width (int): The width of the image.
+            height (int): The height of the image.
+        Kwargs:
+            palette (list[int]|None):
+                If None, the file holds big-endian RGB565 pixels (two bytes per pixel).
+                Otherwise, the file holds packed palette indices (the same format used by `RawBitmap`),
+                and the bits per pixel are the minimum needed for the palette.
+            stripe_lines (int|None):
+                The number of rows read at once (defaults to `stripe_lines` from the constructor).
+                Each stripe needs `stripe_lines * width * 2` bytes of RAM for the output.
+                Stripes are only read and written at the same time when they are written in the background
+                (with `Display`'s `async_show`); otherwise each stripe is written before the next one is read,
+                and only a single output stripe is allocated.
+        """
+        # clip the image to the display
+        col_start = max(0, -x)
+        col_end = min(width, self.width - x)
+        row = max(0, -y)
+        row_end = min(height, self.height - y)
+        if col_end <= col_start or row >= row_end:
+            return
+        out_width = col_end - col_start
+
+        if palette is None:
+            bpp = 16
         else:
-            self._write_normal_buf(y_min, y_max)
+            # This assumes that the bits per pixel is always the minimum possible:
+            bpp = 1
+            while len(palette) > (1 << bpp):
+                bpp += 1
+            if self.use_tiny_buf or self.use_gs8_buf:
+                # palette values are indices into the display palette
+                palette = [self.palette.buf[clr * 2] | (self.palette.buf[clr * 2 + 1] << 8) for clr in palette]
+            palette = array.array('H', palette)
+        if stripe_lines is None:
+            stripe_lines = self._stripe_lines
+
+        # Unclipped RGB565 rows that are already in the panel's byte order can be read straight into the output.
+        direct = bpp == 16 and out_width == width and not self.little_endian
+        # Otherwise, the raw file data for one stripe is read first (plus a byte for pixels that cross a byte boundary).
+        source = None if direct else bytearray((stripe_lines * width * bpp + 7) // 8 + 1)
+        # when stripes are written in the background, a second output buffer is filled while the first is written.
+        stripe_buf = bytearray(out_width * stripe_lines * 2)
+        stripes = (stripe_buf, bytearray(len(stripe_buf)) if self._async_stripes() else stripe_buf)
+        stripe = 0
+
+        # the window is set in panel rows, which are moved by hardware scrolling
+        self._reset_hw_scroll()
+        if self.color_bits == 12:
+            # the image is sent in RGB565, so the panel must accept 16 bit color while it is drawn
+            self._write(_ST7789_COLMOD, bytes([_COLOR_MODE_65K | _COLOR_MODE_16BIT]))
+
+        self._set_window(x + col_start, y + row, x + col_end - 1, y + row_end - 1)
+        with open(file_path, 'rb') as f:
+            while row < row_end:
+                lines = min(stripe_lines, row_end - row)
+                start_bit = row * width * bpp
+                f.seek(start_bit >> 3)
+                output = memoryview(stripes[stripe])[:out_width * lines * 2]
+                if direct:
+                    f.readinto(output)
+                else:
+                    f.readinto(source)
+                    self._convert_stripe(
+                        source, output, start_bit & 7, width, col_start, out_width, lines, bpp, palette,
+                        )
+                self._write_stripe(output)
+
+                stripe ^= 1
+                row += lines
+        self._wait_stripe()
+
+        if self.color_bits == 12:
+            self._write(_ST7789_COLMOD, bytes([_COLOR_MODE_65K | _COLOR_MODE_12BIT]))
+
+
+    def _async_stripes(self) -> bool:
+        """Check if `_write_stripe` returns before the stripe has been written."""
+        return False
+
+
+    def _write_stripe(self, data):
+        """Write a stripe of streamed image data to the display.
+
+        `data` must not be changed until the next call to `_write_stripe` or `_wait_stripe`.
+        """
+        self._write(None, data)
+
+
+    def _wait_stripe(self):
+        """Wait until the last stripe of streamed image data has been written."""
+
+
+    @micropython.viper
+    def _convert_stripe(
+            self,
+            source,
+            dest,
+            bit_offset: int,
+            src_width: int,
+            col_start: int,
+            out_width: int,
+            lines: int,
+            bpp: int,
+            palette):
+        """Convert rows of image data into RGB565 pixels, in the byte order the panel expects.
+
+        16 bit sources are big-endian RGB565, other sources are MSB-first packed palette indices.
+        """
+        src = ptr8(source)
+        output = ptr8(dest)
+        output16 = ptr16(dest)
+        little_endian = bool(self.little_endian)
+
+        out_idx = 0
+        line = 0
+        if bpp == 16:
+            # source pixels are already big-endian, and only need swapping for a little-endian panel
+            first = 1 if little_endian else 0
+            while line < lines:
+                src_idx = (line * src_width + col_start) * 2
+                src_end = src_idx + out_width * 2
+                while src_idx < src_end:
+                    output[out_idx] = src[src_idx + first]
+                    output[out_idx + 1] = src[src_idx + 1 - first]
+                    out_idx += 2
+                    src_idx += 2
+                line += 1
+            return
+
+        colors = ptr16(palette)
+        bitmask = 0xff >> (8 - bpp)
+        while line < lines:
+            bit_idx = bit_offset + (line * src_width + col_start) * bpp
+            out_end = out_idx + out_width
+            while out_idx < out_end:
+                byte_idx = bit_idx >> 3
+                # read 2 bytes, in case the pixel crosses a byte boundary
+                word = (int(src[byte_idx]) << 8) | int(src[byte_idx + 1])
+                color = int(colors[(word >> (16 - bpp - (bit_idx & 7))) & bitmask])
+                if not little_endian:
+                    color = ((color & 0xff) << 8) | (color >> 8)
+                output16[out_idx] = color
+                bit_idx += bpp
+                out_idx += 1
+            line += 1
+
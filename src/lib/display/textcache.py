@@ -0,0 +1,219 @@
+"""A cache of pre-rendered text, for quickly redrawing static labels."""
+
+import framebuf
+
+# mh_if frozen:
+# # frozen firmware must access the font as a module,
+# # rather than a binary file.
+# from font.utf8_8x8 import utf8
+# mh_end_if
+
+
+_DEFAULT_BUDGET = const(4096)
+
+
+
+class TextCache:
+    """Store rendered text as 1-bit masks, and draw them using `FrameBuffer.blit`.
+
+    Masks are keyed by their text and font, and the color is applied when the mask is blitted.
+    This means that the same mask can be reused for text drawn in several colors (like text with a shadow).
+    When the total size of the stored masks exceeds the memory budget,
+    the least recently used masks are discarded.
+
+    Each mask starts one row above the text's `y` position, because UTF8 glyphs are drawn starting one row higher.
+    """
+
+    def __init__(self, display, budget: int = _DEFAULT_BUDGET):
+        """Create the TextCache.
+
+        Args:
+            display (DisplayCore): The display to draw text to.
+            budget (int): The maximum number of bytes to use for stored masks.
+        """
+        self.display = display
+        self.budget = budget
+        # maps (text, font) to [mask framebuffer, width, height, size in bytes, last used]
+        self._masks = {}
+        self._tick = 0
+        self.used = 0
+        self.hits = 0
+        self.misses = 0
+
+        # a 2-pixel palette used for blitting masks to the display.
+        # it uses the same format as the display's framebuffer.
+        self._palette = framebuf.FrameBuffer(
+            bytearray(display._bytes_per_row(2)),
+            2, 1,
+            display.fbuf_format,
+            )
+
+
+    def clear(self):
+        """Discard all stored masks."""
+        self._masks = {}
+        self.used = 0
+
+
+    def text(self, text: str, x: int, y: int, color: int, font=None):
+        """Draw text to the display, using (and storing) a pre-rendered mask.
+
+        Args:
+            text (str): text to write
+            x (int): column to start drawing at
+            y (int): row to start drawing at
+            color (int): encoded color to use for text
+            font (optional): bitmap font module to use
+        """
+        display = self.display
+        key = (text, font)
+        entry = self._masks.get(key)
+        if entry is None:
+            entry = self._render(text, font)
+            if entry is None:
+                # too big to cache, just draw it normally
+                display._draw_text(text, x, y, color, font)
+                return
+            self.misses += 1
+        else:
+            self.hits += 1
+
+        self._tick += 1
+        entry[4] = self._tick
+
+        color = display._format_color(color)
+        palette = self._palette
+        # the transparent key color just needs to be something other than the text color
+        palette.pixel(0, 0, color ^ 1)
+        palette.pixel(1, 0, color)
+
+        display._set_show_area(x, y - 1, x + entry[1], y - 1 + entry[2])
+        display.fbuf.blit(entry[0], x, y - 1, color ^ 1, palette)
+
+
+    def _render(self, text: str, font) -> list|None:
+        """Render the given text to a new mask, and store it."""
+        display = self.display
+        if font is None:
+            width = len(text) * 8
+            height = 9
+        else:
+            width = display._get_total_width(text, font)
+            height = font.HEIGHT + 1
+
+        stride = (width + 7) // 8
+        size = stride * height
+        if size > self.budget or width == 0:
+            return None
+
+        # make room for the new mask
+        while self._masks and self.used + size > self.budget:
+            self._evict()
+
+        buf = bytearray(size)
+        mask = framebuf.FrameBuffer(buf, width, height, framebuf.MONO_HLSB)
+
+        if font is None:
+            x = 0
+            for char in text:
+                ch_ord = ord(char)
+                if ch_ord < 128:
+                    mask.text(char, x, 1, 1)
+                    x += 8
+                else:
+                    x += self._render_utf8(buf, stride, ch_ord, x, 1)
+        else:
+            self._render_bitmap(buf, stride, text, font)
+
+        entry = [mask, width, height, size, 0]
+        self._masks[(text, font)] = entry
+        self.used += size
+        return entry
+
+
+    def _evict(self):
+        """Remove the least recently used mask."""
+        oldest_key = None
+        oldest_tick = None
+        for key, entry in self._masks.items():
+            if oldest_tick is None or entry[4] < oldest_tick:
+                oldest_key = key
+                oldest_tick = entry[4]
+        self.used -= self._masks.pop(oldest_key)[3]
+
+
+    @micropython.viper
+    def _render_bitmap(self, buf, stride:int, text, font):
+        """Render text in the given bitmap font to a mask buffer."""
+        mask = ptr8(buf)
+        width = int(font.WIDTH)
+        height = int(font.HEIGHT)
+        glyphs = ptr8(font.FONT)
+        first = int(font.FIRST)
+        last = int(font.LAST)
+        char_px_len = width * height
+        utf8_scale = height // 8
+
+        x = 0
+        for char in text:
+            ch_idx = int(ord(char))
+
+            if first <= ch_idx < last:
+                bit_start = (ch_idx - first) * char_px_len
+
+                px_idx = 0
+                while px_idx < char_px_len:
+                    bit_idx = px_idx + bit_start
+                    if (glyphs[bit_idx // 8] >> (7 - (bit_idx % 8))) & 1:
+                        # glyph rows start 1 row down in the mask
+                        target_x = x + px_idx % width
+                        target_idx = (px_idx // width + 1) * stride + target_x // 8
+                        mask[target_idx] |= 0x80 >> (target_x % 8)
+                    px_idx += 1
+                x += width
+            else:
+                x += int(self._render_utf8(buf, stride, ch_idx, x, utf8_scale))
+
+
+    @micropython.viper
+    def _render_utf8(self, buf, stride:int, char:int, x:int, scale:int) -> int:
+        """Render a single UTF8 character to a mask buffer."""
+        width = 4 if char < 128 else 8
+        height = 8
+
+        if not 0x0000 <= char <= 0xFFFF:
+            return width * scale
+
+        mask = ptr8(buf)
+
+        # mh_if frozen:
+        # cur = ptr8(utf8)
+        # offset = int(self.display._utf8_offset(utf8, char))
+        # if offset < 0:
+        #     return width * scale
+        # mh_else:
+        cur = ptr8(self.display._glyph_slab)
+        offset = int(self.display._get_glyph(char))
+        # mh_end_if
+
+        # y axis is inverted - we start from bottom not top
+        y = (height - 1) * scale
+
+        px_idx = 0
+        max_px_idx = width * height
+        while px_idx < max_px_idx:
+            if (cur[px_idx // 8 + offset] >> (px_idx % 8)) & 1:
+                target_x = x + ((px_idx % width) * scale)
+                target_y = y - ((px_idx // width) * scale)
+
+                scale_idx = 0
+                num_scale_pixels = scale * scale
+                while scale_idx < num_scale_pixels:
+                    px_x = target_x + scale_idx % scale
+                    px_y = target_y + scale_idx // scale
+                    target_idx = px_y * stride + px_x // 8
+                    mask[target_idx] |= 0x80 >> (px_x % 8)
+                    scale_idx += 1
+            px_idx += 1
+
+        return width * scale
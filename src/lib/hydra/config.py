@@ -24,7 +24,8 @@ DEFAULT_CONFIG = const(
 "timezone": 0,
 "sync_clock": true,
 "language": "en",
-"brightness": 8
+"brightness": 8,
+"glyph_cache_size": 64
 }""")
 
 
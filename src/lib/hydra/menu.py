@@ -144,6 +144,7 @@ class Menu:
             self.scroll_start_ms = time.ticks_ms()
 
         DISPLAY.fill(CONFIG.palette[2])
+        PopUpWin.background_shaded = False
 
         anim_y = self._get_animated_y()
 
@@ -802,9 +803,16 @@ _WINDOW_WRITE_Y_OVERFLOW = const(_WINDOW_WRITE_Y - _FONT_HEIGHT)
 
 _MAX_TEXT_LEN = const(_WINDOW_WIDTH // _FONT_WIDTH)
 
+# how much to darken the menu behind a popup window (0-255)
+_BACKGROUND_DIM = const(128)
+
 class PopUpWin:
     """A popup window that you can write on."""
 
+    # windows are redrawn over themselves with each keypress,
+    # so the menu behind them is only shaded once (until the menu is redrawn).
+    background_shaded = False
+
     def __init__(self, title: str|None = None):
         """Create a PopUpWin."""
         self.title = title
@@ -832,17 +840,20 @@ class PopUpWin:
 
     def draw(self):
         """Draw this window."""
+        if not PopUpWin.background_shaded:
+            PopUpWin.background_shaded = True
+            DISPLAY.dim_rect(0, 0, _MH_DISPLAY_WIDTH, _MH_DISPLAY_HEIGHT, _BACKGROUND_DIM)
+            # drop shadow
+            DISPLAY.dim_rect(
+                _WINDOW_PADDING + 6, _WINDOW_PADDING + _WINDOW_HEIGHT, _WINDOW_WIDTH, 6, _BACKGROUND_DIM,
+                )
+            DISPLAY.dim_rect(
+                _WINDOW_PADDING + _WINDOW_WIDTH, _WINDOW_PADDING + 6, 6, _WINDOW_HEIGHT - 6, _BACKGROUND_DIM,
+                )
+
         DISPLAY.fill_rect(_WINDOW_PADDING, _WINDOW_PADDING, _WINDOW_WIDTH, _WINDOW_HEIGHT, CONFIG.palette[3])
         DISPLAY.rect(_WINDOW_PADDING, _WINDOW_PADDING, _WINDOW_WIDTH, _WINDOW_HEIGHT, CONFIG.palette[5])
 
-        for i in range(6):
-            DISPLAY.hline(_WINDOW_PADDING+i,
-                          _WINDOW_PADDING+_WINDOW_HEIGHT+i,
-                          _WINDOW_WIDTH, CONFIG.palette[0])
-            DISPLAY.vline(_WINDOW_PADDING+_WINDOW_WIDTH+i,
-                          _WINDOW_PADDING+i,
-                          _WINDOW_HEIGHT, CONFIG.palette[0])
-
         if self.title:
             draw_centered_text(
                 str(self.title + ":"),
@@ -928,11 +939,11 @@ def draw_left_text(text:str, y_pos:int, selected):
         y = y_pos + 12
 
     if selected:
-        DISPLAY.text(">", _LEFT_TEXT_ARROW_X, y_pos, CONFIG.palette[8], font=font)
-        DISPLAY.text(text, x-2, y, CONFIG.palette[1], font=fnt)
-        DISPLAY.text(text, x, y, CONFIG.palette[9], font=fnt)
+        DISPLAY.cached_text(">", _LEFT_TEXT_ARROW_X, y_pos, CONFIG.palette[8], font=font)
+        DISPLAY.cached_text(text, x-2, y, CONFIG.palette[1], font=fnt)
+        DISPLAY.cached_text(text, x, y, CONFIG.palette[9], font=fnt)
     else:
-        DISPLAY.text(text, x, y, CONFIG.palette[6], font=fnt)
+        DISPLAY.cached_text(text, x, y, CONFIG.palette[6], font=fnt)
 
 
 # right text
@@ -951,7 +962,7 @@ def draw_right_text(text:str, y_pos:int, *, selected=False):
     if len(text) * _SMALL_FONT_WIDTH_HALF > 80:
          x = ((_MH_DISPLAY_WIDTH // 2) + _RIGHT_TEXT_X_OFFSET)
 
-    DISPLAY.text(
+    DISPLAY.cached_text(
         text,
         x, y_pos+_RIGHT_TEXT_Y,
         CONFIG.palette[7] if selected else CONFIG.palette[4]
@@ -26,6 +26,9 @@ _WINDOW_HEIGHT = const(_MH_DISPLAY_HEIGHT - (_WINDOW_PADDING * 2))
 
 _MAX_TEXT_WIDTH = const(_WINDOW_WIDTH // _FONT_WIDTH)
 
+# how much to darken the screen behind a popup (0-255)
+_BACKGROUND_DIM = const(128)
+
 
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ UIOverlay Class ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 class UIOverlay:
@@ -91,6 +94,11 @@ class PopupObject:
         self.display = ui_overlay.display
 
 
+    def shade_background(self):
+        """Darken everything currently on the display, so that the popup stands out."""
+        self.display.dim_rect(0, 0, self.display.width, self.display.height, _BACKGROUND_DIM)
+
+
     @staticmethod
     def split_lines(text:str, max_length:int=_MAX_TEXT_WIDTH) -> list[str]:
         """Split a string into multiple lines, based on max line-length."""
@@ -162,6 +170,7 @@ class PopupText(PopupObject):
 
     def main(self):
         """Start main loop."""
+        self.shade_background()
         self.draw_text_box(self.text, clr_idx=8)
         self.display.show()
 
@@ -183,6 +192,7 @@ class PopupError(PopupObject):
 
     def main(self):
         """Start the main loop."""
+        self.shade_background()
         self.draw_text_box(self.text, clr_idx=11, bg_clr=0, title="ERROR:")
         self.display.show()
 
@@ -227,6 +237,7 @@ class TextEntry(PopupObject):
 
         Blocks until "enter" key pressed, returning written text.
         """
+        self.shade_background()
         self.draw()
 
         draw_time = time.ticks_ms()
@@ -343,7 +354,7 @@ class PopupOptions(PopupObject):
             x, y, box_width, _OPTION_BOX_HEIGHT,
             self.config.palette[(7 + depth) % 11 if selected else (5 + depth) % 11]
             )
-        self.display.text(
+        self.display.cached_text(
             text, x + _OPTION_X_PADDING, y + _OPTION_Y_PADDING + 1,
             self.config.palette[(9 + depth) % 11 if selected else (6 + depth) % 11])
 
@@ -371,12 +382,12 @@ class PopupOptions(PopupObject):
                 title_box_x, title_box_y,
                 title_box_width, _OPTION_BOX_HEIGHT + _OPTION_Y_PADDING,
                 self.config.palette[(3 + depth) % 11], fill=True)
-            self.display.text(
+            self.display.cached_text(
                 self.title,
                 title_x, title_box_y + _OPTION_Y_PADDING + 1,
                 self.config.palette[(5 + depth) % 11],
                 )
-            self.display.text(
+            self.display.cached_text(
                 self.title,
                 title_x, title_box_y + _OPTION_Y_PADDING,
                 self.config.palette[(6 + depth) % 11],
@@ -438,6 +449,7 @@ class PopupOptions(PopupObject):
 
         Blocks until "enter" key pressed, returning option str.
         """
+        self.shade_background()
         self.draw()
 
 
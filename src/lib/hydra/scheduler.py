@@ -0,0 +1,181 @@
+"""A frame scheduler, for pacing the main loop of MicroHydra apps."""
+
+import array
+import time
+
+from lib.display import Display
+from lib.hydra.utils import get_instance
+
+
+_DEFAULT_FPS = const(30)
+_DEFAULT_IDLE_FPS = const(10)
+_DEFAULT_IDLE_AFTER_MS = const(3000)
+
+# number of frame times kept for `frame_time`
+_FRAME_HISTORY = const(64)
+
+
+
+class FrameScheduler:
+    """Run an app's update and draw callbacks at a steady frame rate.
+
+    Each frame, every update callback is called, then every draw callback (only if the frame is dirty),
+    and finally `Display.show` (which is cheap when nothing was drawn, and keeps overlays up to date).
+    When the display uses `band_lines`, the draw callbacks are replayed once for each band by `Display.show`,
+    so they should only draw (and not change any state).
+
+    Update callbacks should handle input and app logic, and return True when they are "active"
+    (when they handled some input, or are animating something).
+    An active frame is always drawn, and keeps the scheduler running at full speed.
+    When nothing has been active for `idle_after_ms`, the scheduler drops to the (slower) idle frame rate,
+    which still polls for input, but saves a lot of power.
+
+    `invalidate` can be used to draw the next frame without leaving idle mode (for example, to blink a cursor).
+    `FrameScheduler.active` is the scheduler that ran the most recent frame (so that other modules can invalidate it).
+    """
+
+    active = None
+
+    def __init__(
+            self,
+            *,
+            fps: int = _DEFAULT_FPS,
+            idle_fps: int = _DEFAULT_IDLE_FPS,
+            idle_after_ms: int = _DEFAULT_IDLE_AFTER_MS,
+            display: Display|None = None):
+        """Create a FrameScheduler.
+
+        Kwargs:
+            fps (int): The target frame rate while active.
+            idle_fps (int): The frame rate used while idle.
+            idle_after_ms (int): How long to wait without any activity before going idle.
+            display (Display|None): The display to show each frame (defaults to the Display instance).
+        """
+        self.display = get_instance(Display) if display is None else display
+        self.frame_ms = 1000 // fps
+        self.idle_ms = 1000 // idle_fps
+        self.idle_after_ms = idle_after_ms
+
+        self._updates = []
+        self._draws = []
+
+        self.running = False
+        self.dirty = True
+        self.idle = False
+        self._last_active = time.ticks_ms()
+        self._next_frame = self._last_active
+
+        # stats:
+        self.frames_drawn = 0
+        self.frames_skipped = 0
+        # ring buffer of recent frame times (in microseconds)
+        self._frame_times = array.array('I', bytes(_FRAME_HISTORY * 4))
+        self._frame_count = 0
+
+
+    def add_update(self, callback: callable):
+        """Add a callback to be called every frame.
+
+        The callback takes no arguments, and should return True when it is active.
+        """
+        self._updates.append(callback)
+
+
+    def add_draw(self, callback: callable):
+        """Add a callback to be called each time a frame is drawn.
+
+        The callback takes no arguments.
+        """
+        self._draws.append(callback)
+
+
+    def invalidate(self):
+        """Flag that the next frame needs to be drawn."""
+        self.dirty = True
+
+
+    def wake(self):
+        """Leave idle mode (as if a callback was active)."""
+        self._last_active = time.ticks_ms()
+        self.idle = False
+        self.dirty = True
+
+
+    def tick(self):
+        """Run a single frame, then wait until the next frame is due."""
+        start_us = time.ticks_us()
+        FrameScheduler.active = self
+        perf = Display.perf
+        if perf is not None:
+            perf.begin_frame()
+
+        active = False
+        for callback in self._updates:
+            if callback():
+                active = True
+        if active:
+            self._last_active = time.ticks_ms()
+            self.dirty = True
+
+        display = self.display
+        if self.dirty:
+            # clear the flag first, so that draw callbacks can request another frame
+            self.dirty = False
+            if display.band_lines:
+                # in banded mode, the draw callbacks are replayed for each band by `show`
+                display.band_callback = self._draw
+            else:
+                self._draw()
+            self.frames_drawn += 1
+            display.show()
+        else:
+            self.frames_skipped += 1
+            if not display.band_lines:
+                # (this is cheap when nothing was drawn, and keeps overlays up to date)
+                display.show()
+
+        self._frame_times[self._frame_count % _FRAME_HISTORY] = time.ticks_diff(time.ticks_us(), start_us)
+        self._frame_count += 1
+
+        # pace the next frame
+        now = time.ticks_ms()
+        self.idle = time.ticks_diff(now, self._last_active) >= self.idle_after_ms
+        self._next_frame = time.ticks_add(self._next_frame, self.idle_ms if self.idle else self.frame_ms)
+        wait = time.ticks_diff(self._next_frame, now)
+        if wait > 0:
+            time.sleep_ms(wait)
+        else:
+            # we're behind schedule (or a callback blocked for a while),
+            # start counting again from now, rather than rushing to catch up.
+            self._next_frame = now
+
+
+    def _draw(self):
+        """Call each draw callback."""
+        for callback in self._draws:
+            callback()
+
+
+    def run(self):
+        """Run frames until `stop` is called."""
+        self.running = True
+        self._next_frame = time.ticks_ms()
+        while self.running:
+            self.tick()
+
+
+    def stop(self):
+        """Stop `run` after the current frame."""
+        self.running = False
+
+
+    def frame_time(self, percentile: int = 50) -> int:
+        """Get the given percentile of recent frame times, in microseconds.
+
+        Frame times only include the time spent in callbacks and `Display.show`, not time spent waiting.
+        """
+        count = min(self._frame_count, _FRAME_HISTORY)
+        if count == 0:
+            return 0
+        times = sorted(self._frame_times[:count])
+        return times[min(count - 1, count * percentile // 100)]
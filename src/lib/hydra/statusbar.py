@@ -4,6 +4,7 @@ import time
 
 from machine import Timer
 from lib.display import Display
+from lib.display.overlay import Overlay
 from lib.hydra.config import Config
 from lib.hydra.utils import get_instance
 
@@ -26,6 +27,11 @@ _BATTERY_HEIGHT = const(10)
 _BATTERY_X = const(_MH_DISPLAY_WIDTH - 28)
 _BATTERY_Y = const((_STATUSBAR_HEIGHT - 10) // 2)
 
+# how often to check whether the statusbar is out of date
+_UPDATE_PERIOD_MS = const(1000)
+# the battery level is only checked once every this many updates
+_BATTERY_CHECK_UPDATES = const(10)
+
 
 
 class StatusBar:
@@ -41,21 +47,36 @@ class StatusBar:
             from launcher.icons import battery
             self.batt = battlevel.Battery()
 
-        if enable_clock:
-            # If drawing the clock, set a timer to periodically redraw the overlay
-            self.timer = Timer(2, mode=Timer.PERIODIC, period=60_000, callback=self._update_overlay)
-
         self.enable_clock = enable_clock
         self.enable_battery = enable_battery
 
         self.config = get_instance(Config)
 
-        Display.overlay_callbacks.append(self._overlay)
+        # the minute and battery level currently drawn
+        self._drawn_minute = -1
+        self._drawn_batt = -1
+        self._updates = 0
 
+        # The statusbar is only redrawn when the timer invalidates it.
+        # Otherwise, a cached copy is restored when an app draws over it.
+        self.overlay = Overlay(0, 0, _MH_DISPLAY_WIDTH, _STATUSBAR_HEIGHT + 1, self._overlay, cache=True)
+        Display.overlays.append(self.overlay)
 
-    @staticmethod
-    def _update_overlay(_):
-        Display.draw_overlays = True
+        if enable_clock or enable_battery:
+            # set a timer to periodically check if the overlay needs to be redrawn
+            self.timer = Timer(2, mode=Timer.PERIODIC, period=_UPDATE_PERIOD_MS, callback=self._update_overlay)
+
+
+    def _update_overlay(self, _):
+        """Invalidate the overlay when the drawn time (or battery level) is out of date."""
+        if self.enable_clock and time.localtime()[4] != self._drawn_minute:
+            self.overlay.invalidate()
+        elif self.enable_battery:
+            self._updates += 1
+            if self._updates >= _BATTERY_CHECK_UPDATES:
+                self._updates = 0
+                if self.batt.read_level() != self._drawn_batt:
+                    self.overlay.invalidate()
 
 
     @staticmethod
@@ -91,12 +112,13 @@ class StatusBar:
         # clock
         if self.enable_clock:
             _, _, _, hour_24, minute, _, _, _ = time.localtime()
+            self._drawn_minute = minute
 
             if self.config['24h_clock']:
                 formatted_time = f"{hour_24}:{minute:02d}"
             else:
                 formatted_time, ampm = self._time_24_to_12(hour_24, minute)
-                display.text(
+                display.cached_text(
                     ampm,
                     _CLOCK_AMPM_X_OFFSET
                     + (len(formatted_time)
@@ -104,7 +126,7 @@ class StatusBar:
                     _CLOCK_AMPM_Y + 1,
                     self.config.palette[5],
                 )
-                display.text(
+                display.cached_text(
                     ampm,
                     _CLOCK_AMPM_X_OFFSET
                     + (len(formatted_time)
@@ -113,12 +135,12 @@ class StatusBar:
                     self.config.palette[2],
                 )
 
-            display.text(
+            display.cached_text(
                 formatted_time,
                 _CLOCK_X, _CLOCK_Y+1,
                 self.config.palette[2],
             )
-            display.text(
+            display.cached_text(
                 formatted_time,
                 _CLOCK_X, _CLOCK_Y,
                 self.config.palette[7],
@@ -127,6 +149,7 @@ class StatusBar:
         # battery
         if self.enable_battery:
             batt_lvl = self.batt.read_level()
+            self._drawn_batt = batt_lvl
             display.bitmap(
                 battery,
                 _BATTERY_X,
@@ -10,6 +10,7 @@ such as key repetition, and global keyboard shortcuts.
 import time
 from lib.hydra.config import Config
 from lib.display import Display
+from lib.display.overlay import Overlay
 from lib.hydra.utils import get_instance
 import machine
 from . import _keys
@@ -20,6 +21,8 @@ from . import _keys
 
 
 
+_MH_DISPLAY_WIDTH = const(240)
+
 # Used for drawing locked keys to display:
 _PADDING = const(3)
 _FONT_WIDTH = const(8)
@@ -76,7 +79,8 @@ class UserInput(_keys.Keys):
         self.use_sys_commands = use_sys_commands
 
         # setup locked key overlay:
-        Display.overlay_callbacks.append(self._locked_keys_overlay)
+        self.locked_keys_overlay = Overlay(0, 0, _MH_DISPLAY_WIDTH, _BOX_HEIGHT + 1, self._locked_keys_overlay)
+        Display.overlays.append(self.locked_keys_overlay)
 
         # init _keys.Keys
         super().__init__(**kwargs)
@@ -138,6 +142,10 @@ class UserInput(_keys.Keys):
 
     def get_new_keys(self) -> list[str]:
         """Return a list of keys which are newly pressed."""
+        perf = Display.perf
+        if perf is not None:
+            start = time.ticks_us()
+
         self.populate_tracker()
 
         if self.locking_keys:
@@ -149,6 +157,8 @@ class UserInput(_keys.Keys):
         if self.use_sys_commands:
             self.system_commands(keylist)
 
+        if perf is not None:
+            perf.input_us += time.ticks_diff(time.ticks_us(), start)
         return keylist
 
 
@@ -216,7 +226,7 @@ class UserInput(_keys.Keys):
                             locked_keys.remove(key)
                             tracker[key] = False
                             # Redraw the locked keys overlay
-                            Display.draw_overlays = True
+                            self.locked_keys_overlay.invalidate()
 
                         elif len(self.key_state) > 1:
                             # multiple keys are being pressed together, dont lock this key
@@ -226,7 +236,7 @@ class UserInput(_keys.Keys):
                         locked_keys.append(key)
                         tracker.pop(key)
                         # Redraw the locked keys overlay
-                        Display.draw_overlays = True
+                        self.locked_keys_overlay.invalidate()
 
                 # tracker val is False
                 elif not is_being_pressed:
@@ -258,6 +268,12 @@ class UserInput(_keys.Keys):
                     if setting == 'brightness':
                         Display.instance.set_brightness(self.config['brightness'])
 
+            if "p" in keylist:
+                # toggle the performance HUD
+                keylist.remove("p")
+                from lib.display.perfhud import PerfHUD
+                PerfHUD.toggle()
+
             if "q" in keylist:
                 self.config.save()
                 machine.RTC().memory("")
@@ -69,7 +69,8 @@ def convert_to_bitmap(image_file: str, bits_requested: int):
     palette = img.getpalette()
     palette_colors = len(palette) // 3
     actual_colors = min(palette_colors, colors_requested)
-    bits_required = actual_colors.bit_length()
+    # (the highest palette index is actual_colors - 1, so 256 colors need 8 bits, not 9)
+    bits_required = max(1, (actual_colors - 1).bit_length())
     if bits_required < bits_requested:
         print(
             f"\nNOTE: Quantization reduced colors to {palette_colors} from the {bits_requested} "
@@ -0,0 +1,164 @@
+"""Create a compact subset of the MicroHydra utf8 font.
+
+The full utf8 font (as output by `generate_utf8_font.py`/`merge_font_bins.py`) stores all 65536 code points,
+even though most of them are never used. This script creates a much smaller font containing only the glyphs
+needed for the given languages, and for the strings in MicroHydra's I18n translation tables.
+Latin and Cyrillic glyphs are always included.
+
+The subset font is formatted like this (all values little-endian):
+- 4 byte magic number: b'MHU8'
+- 2 byte glyph count
+- 2 padding bytes
+- sorted list of 2 byte code points (one per glyph)
+- 8 byte glyphs, in the same order as the code points
+
+MicroHydra finds glyphs in the subset font using a binary search of the code points.
+Glyphs that aren't in the font are drawn as blank spaces.
+
+Example:
+`python3 tools/utf8_util/build_font_subset.py --langs zh ja --py`
+"""
+
+import argparse
+import json
+import os
+import re
+
+
+PARSER = argparse.ArgumentParser(
+    prog='build_font_subset',
+    description="Create a compact subset of the MicroHydra utf8 font.",
+)
+PARSER.add_argument(
+    '-i', '--input',
+    default=os.path.join('tools', 'utf8_util', 'utf8_8x8.bin'),
+    help='Path to the full 65536 glyph font bin.',
+)
+PARSER.add_argument(
+    '-o', '--output',
+    default=os.path.join('tools', 'utf8_util', 'utf8_8x8_subset.bin'),
+    help='Path to write the subset font bin to.',
+)
+PARSER.add_argument(
+    '-l', '--langs', nargs='*', default=[],
+    help='Languages (or named ranges) to include. Options: ' + ', '.join(
+        ('latin', 'cyrillic', 'greek', 'symbols', 'zh', 'ja', 'ko'),
+    ),
+)
+PARSER.add_argument(
+    '-s', '--source',
+    default='src',
+    help='Path to search for I18n translation tables.',
+)
+PARSER.add_argument('-t', '--text', default='', help='Any extra characters to include.')
+PARSER.add_argument('--py', action='store_true', help='Also write a .py version of the font, for freezing.')
+SCRIPT_ARGS = PARSER.parse_args()
+
+
+# Unicode ranges to include for each language.
+# Ranges are inclusive.
+LANG_RANGES = {
+    'latin': ((0x0020, 0x024F), (0x1E00, 0x1EFF)),
+    'cyrillic': ((0x0400, 0x052F),),
+    'greek': ((0x0370, 0x03FF),),
+    'symbols': (
+        (0x2000, 0x206F),  # General punctuation
+        (0x20A0, 0x20CF),  # Currency symbols
+        (0x2190, 0x21FF),  # Arrows
+        (0x2500, 0x25FF),  # Box drawing, block elements, geometric shapes
+        (0x2600, 0x26FF),  # Miscellaneous symbols
+        ),
+    'zh': (
+        (0x3000, 0x303F),  # CJK symbols and punctuation
+        (0x4E00, 0x9FFF),  # CJK unified ideographs
+        (0xFF00, 0xFFEF),  # Halfwidth and fullwidth forms
+        ),
+    'ja': (
+        (0x3000, 0x303F),  # CJK symbols and punctuation
+        (0x3040, 0x30FF),  # Hiragana, Katakana
+        (0x4E00, 0x9FFF),  # CJK unified ideographs
+        (0xFF00, 0xFFEF),  # Halfwidth and fullwidth forms
+        ),
+    'ko': (
+        (0x1100, 0x11FF),  # Hangul Jamo
+        (0x3130, 0x318F),  # Hangul compatibility Jamo
+        (0xAC00, 0xD7AF),  # Hangul syllables
+        ),
+}
+
+# These are always included
+DEFAULT_LANGS = ('latin', 'cyrillic')
+
+_MAGIC = b'MHU8'
+_GLYPH_SIZE = 8
+_EMPTY_GLYPH = bytes(_GLYPH_SIZE)
+
+_TRANS_RE = re.compile(r'_TRANS\s*=\s*const\(\s*"""(.*?)"""\s*\)', re.DOTALL)
+
+
+
+def find_translation_chars(source_path: str) -> set[int]:
+    """Find all the characters used in I18n translation tables under the given path."""
+    code_points = set()
+    for dirpath, _, filenames in os.walk(source_path):
+        for filename in filenames:
+            if not filename.endswith('.py'):
+                continue
+            with open(os.path.join(dirpath, filename), encoding='utf-8') as f:
+                source = f.read()
+            for match in _TRANS_RE.finditer(source):
+                for item in json.loads(match.group(1)):
+                    for text in item.values():
+                        code_points.update(ord(char) for char in text)
+    return code_points
+
+
+def collect_code_points() -> set[int]:
+    """Get every code point requested by the script args."""
+    code_points = set()
+    for lang in (*DEFAULT_LANGS, *SCRIPT_ARGS.langs):
+        if lang not in LANG_RANGES:
+            msg = f"Unknown language '{lang}'. Options are: {', '.join(LANG_RANGES)}"
+            raise ValueError(msg)
+        for start, end in LANG_RANGES[lang]:
+            code_points.update(range(start, end + 1))
+
+    code_points.update(find_translation_chars(SCRIPT_ARGS.source))
+    code_points.update(ord(char) for char in SCRIPT_ARGS.text)
+    # the font only covers the basic multilingual plane
+    return {code for code in code_points if code <= 0xFFFF}
+
+
+def main():
+    """Build the subset font."""
+    with open(SCRIPT_ARGS.input, 'rb') as f:
+        full_font = f.read()
+
+    index = bytearray()
+    glyphs = bytearray()
+    for code in sorted(collect_code_points()):
+        glyph = full_font[code * _GLYPH_SIZE : (code + 1) * _GLYPH_SIZE]
+        # blank glyphs don't need to be stored
+        if glyph == _EMPTY_GLYPH:
+            continue
+        index += code.to_bytes(2, 'little')
+        glyphs += glyph
+
+    count = len(index) // 2
+    data = _MAGIC + count.to_bytes(2, 'little') + bytes(2) + index + glyphs
+
+    with open(SCRIPT_ARGS.output, 'wb') as f:
+        f.write(data)
+    print(f"Wrote {count} glyphs ({len(data)} bytes) to {SCRIPT_ARGS.output}")
+
+    if SCRIPT_ARGS.py:
+        py_output = os.path.splitext(SCRIPT_ARGS.output)[0] + '.py'
+        with open(py_output, 'w') as f:
+            f.write(f"""\
+_UTF8 = const({data})
+utf8 = memoryview(_UTF8)
+""")
+        print(f"Wrote {py_output}")
+
+
+main()